@@ -4,6 +4,8 @@ Simple Poker Agent Bot
 
 This is a basic bot that connects to the Agent API and plays poker.
 It uses a simple strategy: always check/call, never bet or raise.
+Game state is received from the Agent API's Server-Sent Events stream,
+so the bot reacts as soon as the state changes instead of polling.
 
 Usage:
     1. Start all services (auth API, game server, agent API)
@@ -15,10 +17,17 @@ Usage:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import argparse
+import logging
+import orjson
+import os
 import sys
 
+logger = logging.getLogger(__name__)
+
 class PokerAgent:
     def __init__(self, token: str, game_id: str, user_id: int, api_base: str = "http://localhost:8001/api/v1"):
         self.token = token
@@ -27,25 +36,92 @@ class PokerAgent:
         self.api_base = api_base
         self.headers = {"Authorization": f"Bearer {token}"}
         self.my_player_id = None
+        # Last state and its ETag, so unchanged polls come back as 304s
+        self._state_etag = None
+        self._last_state = None
+        # Players of the most recent state keyed by id, built in is_my_turn
+        self._players_by_id = {}
+
+        # Reuse one keep-alive connection pool for every request. Only GETs are
+        # retried on gateway errors; actions must never be sent twice.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.headers["Connection"] = "keep-alive"
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(
+                total=2,
+                connect=2,
+                read=0,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
     def get_state(self) -> dict:
         """Fetch the current game state"""
         try:
-            response = requests.get(
+            headers = {"If-None-Match": self._state_etag} if self._state_etag else None
+            response = self.session.get(
                 f"{self.api_base}/game/{self.game_id}/state",
-                headers=self.headers,
+                headers=headers,
                 timeout=5
             )
             
+            if response.status_code == 304:
+                return self._last_state
             if response.status_code == 200:
-                return response.json()
+                self._last_state = orjson.loads(response.content)
+                self._state_etag = response.headers.get("ETag")
+                return self._last_state
             else:
-                print(f"❌ Error getting state: {response.status_code} - {response.text}")
+                logger.warning("❌ Error getting state: %s - %s", response.status_code, response.text)
                 return None
         except Exception as e:
-            print(f"❌ Exception getting state: {e}")
+            logger.warning("❌ Exception getting state: %s", e)
             return None
     
+    def stream_states(self, read_timeout: float = 30.0):
+        """
+        Yield game states from the Agent API's event stream.
+        Returns when the stream ends; raises on connection errors.
+        """
+        with self.session.get(
+            f"{self.api_base}/game/{self.game_id}/state/stream",
+            stream=True,
+            timeout=(5, read_timeout)
+        ) as response:
+            if response.status_code != 200:
+                logger.warning("❌ Error opening state stream: %s - %s", response.status_code, response.text)
+                return
+
+            event = "message"
+            data_lines = []
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    field, _, value = line.partition(":")
+                    if field == "event":
+                        event = value.strip()
+                    elif field == "data":
+                        data_lines.append(value.lstrip())
+                    continue
+
+                # A blank line terminates the event
+                if data_lines:
+                    payload = orjson.loads("\n".join(data_lines))
+                    if event == "state":
+                        yield payload
+                    elif event == "error":
+                        logger.warning("❌ State stream error: %s", payload.get('error'))
+                        return
+                event = "message"
+                data_lines = []
+    
     def perform_action(self, action: str, amount: int = None) -> dict:
         """Perform a poker action"""
         try:
@@ -53,22 +129,21 @@ class PokerAgent:
             if amount is not None:
                 body["amount"] = amount
             
-            print(f"🎯 Performing action: {action}" + (f" {amount}" if amount else ""))
+            logger.info("🎯 Performing action: %s%s", action, f" {amount}" if amount else "")
             
-            response = requests.post(
+            response = self.session.post(
                 f"{self.api_base}/game/{self.game_id}/action",
-                headers=self.headers,
                 json=body,
                 timeout=30
             )
             
             if response.status_code == 200:
-                return response.json()
+                return orjson.loads(response.content)
             else:
-                print(f"❌ Error performing action: {response.status_code} - {response.text}")
+                logger.warning("❌ Error performing action: %s - %s", response.status_code, response.text)
                 return None
         except Exception as e:
-            print(f"❌ Exception performing action: {e}")
+            logger.warning("❌ Exception performing action: %s", e)
             return None
     
     def is_my_turn(self, state: dict) -> bool:
@@ -77,22 +152,23 @@ class PokerAgent:
             return False
         
         game_state = state["gameState"]
+        players = game_state.get("players", [])
+        self._players_by_id = {player.get("id"): player for player in players}
         
         # Get my player ID from the state
         if self.my_player_id is None:
-            for player in game_state.get("players", []):
+            for player in players:
                 # Find player by checking if they have our hole cards visibility
                 # (In player-specific state, only our cards are revealed)
                 if player.get("holeCards") and len(player["holeCards"]) > 0:
                     if player["holeCards"][0].get("suit"):  # Our cards have suit/rank
                         self.my_player_id = player["id"]
-                        print(f"🆔 My player ID: {self.my_player_id}")
+                        logger.info("🆔 My player ID: %s", self.my_player_id)
                         break
         
         # Check if it's my turn
         current_player_index = game_state.get("currentPlayerIndex")
         if current_player_index is not None:
-            players = game_state.get("players", [])
             if 0 <= current_player_index < len(players):
                 current_player = players[current_player_index]
                 return current_player.get("id") == self.my_player_id
@@ -112,12 +188,8 @@ class PokerAgent:
         game_state = state["gameState"]
         current_bet = game_state.get("currentBet", 0)
         
-        # Find my player info
-        my_player = None
-        for player in game_state.get("players", []):
-            if player.get("id") == self.my_player_id:
-                my_player = player
-                break
+        # Find my player info (indexed by is_my_turn for this state)
+        my_player = self._players_by_id.get(self.my_player_id)
         
         if not my_player:
             return ("fold", None)
@@ -126,7 +198,7 @@ class PokerAgent:
         my_current_bet = my_player.get("currentBet", 0)
         amount_to_call = current_bet - my_current_bet
         
-        print(f"💭 Thinking... Current bet: {current_bet}, My bet: {my_current_bet}, Stack: {my_stack}")
+        logger.debug("💭 Thinking... Current bet: %s, My bet: %s, Stack: %s", current_bet, my_current_bet, my_stack)
         
         # If no bet, check
         if current_bet == 0:
@@ -143,78 +215,82 @@ class PokerAgent:
         # Last resort: fold
         return ("fold", None)
     
-    def run(self, poll_interval: float = 2.0):
+    def handle_state(self, state: dict, max_attempts: int = 3, retry_delay: float = 1.0):
+        """React to a single game state update"""
+        # Check if it's our turn
+        if self.is_my_turn(state):
+            logger.info("🎲 It's my turn!")
+            
+            for attempt in range(1, max_attempts + 1):
+                # Decide action
+                action, amount = self.decide_action(state)
+                
+                # Perform action
+                result = self.perform_action(action, amount)
+                
+                if result:
+                    game_state = result.get("gameState", {})
+                    logger.info(
+                        "✅ Action '%s' completed successfully (pot: %s, stage: %s)",
+                        action, game_state.get("pot", 0), game_state.get("stage", "unknown")
+                    )
+                    return
+                
+                logger.warning("❌ Failed to perform action '%s' (attempt %s/%s)", action, attempt, max_attempts)
+                if attempt == max_attempts:
+                    return
+                
+                # The stream only emits on change, so nothing else will wake us
+                # for this turn. Re-fetch the state and retry only if it is still
+                # our turn; a timed-out action may have gone through anyway.
+                time.sleep(retry_delay)
+                state = self.get_state()
+                if not self.is_my_turn(state):
+                    return
+        elif logger.isEnabledFor(logging.DEBUG):
+            # Not our turn, just show status
+            game_state = state.get("gameState", {})
+            logger.debug(
+                "⏳ Waiting... Stage: %s, Pot: %s, Current bet: %s",
+                game_state.get("stage", "unknown"), game_state.get("pot", 0), game_state.get("currentBet", 0)
+            )
+    
+    def run(self, reconnect_delay: float = 2.0):
         """Main game loop"""
-        print(f"🤖 Poker Agent starting...")
-        print(f"   Game ID: {self.game_id}")
-        print(f"   User ID: {self.user_id}")
-        print(f"   Polling every {poll_interval}s")
-        print()
+        logger.info("🤖 Poker Agent starting...")
+        logger.info("   Game ID: %s", self.game_id)
+        logger.info("   User ID: %s", self.user_id)
+        logger.info("   Streaming state updates (reconnect delay %ss)", reconnect_delay)
         
         consecutive_errors = 0
         max_errors = 5
         
         while True:
             try:
-                # Get current state
-                state = self.get_state()
-                
-                if state is None:
-                    consecutive_errors += 1
-                    if consecutive_errors >= max_errors:
-                        print(f"❌ Too many errors ({max_errors}), stopping.")
-                        break
-                    time.sleep(poll_interval)
-                    continue
-                
-                # Reset error counter on success
-                consecutive_errors = 0
+                for state in self.stream_states():
+                    # Reset error counter on success
+                    consecutive_errors = 0
+                    self.handle_state(state)
                 
-                # Check if it's our turn
-                if self.is_my_turn(state):
-                    print("\n" + "="*50)
-                    print("🎲 It's my turn!")
-                    
-                    # Decide action
-                    action, amount = self.decide_action(state)
-                    
-                    # Perform action
-                    result = self.perform_action(action, amount)
-                    
-                    if result:
-                        print(f"✅ Action '{action}' completed successfully")
-                        
-                        # Display updated state
-                        if "gameState" in result:
-                            game_state = result["gameState"]
-                            print(f"   Pot: {game_state.get('pot', 0)}")
-                            print(f"   Stage: {game_state.get('stage', 'unknown')}")
-                    else:
-                        print(f"❌ Failed to perform action '{action}'")
-                    
-                    print("="*50 + "\n")
-                else:
-                    # Not our turn, just show status
-                    game_state = state.get("gameState", {})
-                    stage = game_state.get("stage", "unknown")
-                    pot = game_state.get("pot", 0)
-                    current_bet = game_state.get("currentBet", 0)
-                    
-                    print(f"⏳ Waiting... Stage: {stage}, Pot: {pot}, Current bet: {current_bet}")
-                
-                # Wait before next poll
-                time.sleep(poll_interval)
+                # The server closed the stream; reconnect
+                consecutive_errors += 1
                 
             except KeyboardInterrupt:
-                print("\n\n🛑 Agent stopped by user")
+                logger.info("🛑 Agent stopped by user")
                 break
             except Exception as e:
-                print(f"❌ Unexpected error: {e}")
+                logger.error("❌ Unexpected error: %s", e)
                 consecutive_errors += 1
-                if consecutive_errors >= max_errors:
-                    print(f"❌ Too many errors ({max_errors}), stopping.")
-                    break
-                time.sleep(poll_interval)
+            
+            if consecutive_errors >= max_errors:
+                logger.error("❌ Too many errors (%s), stopping.", max_errors)
+                break
+            
+            try:
+                time.sleep(reconnect_delay)
+            except KeyboardInterrupt:
+                logger.info("🛑 Agent stopped by user")
+                break
 
 def main():
     parser = argparse.ArgumentParser(description="Simple Poker Agent Bot")
@@ -223,10 +299,12 @@ def main():
     parser.add_argument("--user-id", required=True, type=int, help="Your user ID")
     parser.add_argument("--api-base", default="http://localhost:8001/api/v1", 
                        help="Base URL for Agent API")
-    parser.add_argument("--poll-interval", type=float, default=2.0,
-                       help="Seconds between state polls (default: 2.0)")
+    parser.add_argument("--reconnect-delay", type=float, default=2.0,
+                       help="Seconds to wait before reopening a dropped state stream (default: 2.0)")
     
     args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(message)s")
     
     # Create and run agent
     agent = PokerAgent(
@@ -236,7 +314,7 @@ def main():
         api_base=args.api_base
     )
     
-    agent.run(poll_interval=args.poll_interval)
+    agent.run(reconnect_delay=args.reconnect_delay)
 
 if __name__ == "__main__":
     main()
@@ -17,20 +17,38 @@ Architecture:
     - Listens for 'game_state_update' events
     - Emits 'game_action' events when it's our turn
     - No polling, no intermediate API layer
+    - Runs on asyncio (uvloop when installed) so many bots can share a host
 """
 
 import socketio
 import argparse
+import asyncio
+import logging
 import sys
-import time
 import re
 import os
+import threading
 from typing import Optional, Tuple
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional and unavailable on Windows
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
 class WebSocketPokerAgent:
     """
     Real-time poker agent using WebSocket connection to game server.
     """
+
+    # Delay before acting on a state update; later updates in the window replace it
+    STATE_COALESCE_SECONDS = 0.01
+    _SUIT_SYMBOLS = {'hearts': '♥', 'diamonds': '♦', 'clubs': '♣', 'spades': '♠'}
+    # Shared payloads for actions without an amount; never mutated
+    _ACTION_PAYLOADS = {
+        action: {'action': action} for action in ('fold', 'check', 'call', 'all-in')
+    }
     
     def __init__(
         self,
@@ -38,7 +56,8 @@ class WebSocketPokerAgent:
         game_id: str,
         user_id: int,
         server_url: str = "http://localhost:3000",
-        action_delay_seconds: float = 0.0
+        action_delay_seconds: float = 0.0,
+        game_started_event: Optional[threading.Event] = None
     ):
         self.token = token
         self.game_id = game_id
@@ -49,9 +68,36 @@ class WebSocketPokerAgent:
         self.my_player_id: Optional[str] = None
         self.connected = False
         self.game_started = False
+        # Set on the first game update; pass one Event to several agents to
+        # wait for whichever of them sees the game start first
+        self.game_started_event = game_started_event or threading.Event()
+        # Set once a hand_complete event arrives; other threads can wait on it
+        self.hand_done = threading.Event()
+        # Payload of the most recent hand_complete event
+        self.last_hand: Optional[dict] = None
+        # Position of our player in the players list, refreshed only when
+        # the seating order changes
+        self._my_index: Optional[int] = None
+        self._player_ids: Tuple[str, ...] = ()
+        # Bursts of state updates are coalesced so only the latest is acted on
+        self._pending_state: Optional[dict] = None
+        self._pending_handle: Optional[asyncio.TimerHandle] = None
+        # Only one flush runs at a time; updates arriving meanwhile are picked
+        # up by the running flush once its action has been sent
+        self._flushing = False
+        # Snapshot of the turn we last acted on, so a stale update for the
+        # same turn cannot trigger a second action
+        self._acted_turn: Optional[tuple] = None
+        # Event loop driving the client while connect_and_play() is running
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Create Socket.IO client
-        self.sio = socketio.Client(logger=False, engineio_logger=False)
+        self.sio = socketio.AsyncClient(
+            logger=False,
+            engineio_logger=False,
+            reconnection=True,
+            reconnection_delay=0.5
+        )
         
         # Register event handlers
         self.setup_event_handlers()
@@ -60,26 +106,26 @@ class WebSocketPokerAgent:
         """Register all Socket.IO event handlers"""
         
         @self.sio.event
-        def connect():
+        async def connect():
             """Called when connection is established"""
-            print("✅ Connected to game server!")
+            logger.info("✅ Connected to game server!")
             self.connected = True
-            print(f"👂 Waiting for game updates (game_id: {self.game_id})...")
+            logger.info("👂 Waiting for game updates (game_id: %s)...", self.game_id)
         
         @self.sio.event
-        def disconnect():
+        async def disconnect():
             """Called when connection is lost"""
-            print("❌ Disconnected from game server")
+            logger.warning("❌ Disconnected from game server")
             self.connected = False
         
         @self.sio.event
-        def connect_error(data):
+        async def connect_error(data):
             """Called when connection fails"""
-            print(f"❌ Connection error: {data}")
+            logger.warning("❌ Connection error: %s", data)
             self.connected = False
         
         @self.sio.on('game_state_update')
-        def on_game_state_update(data):
+        async def on_game_state_update(data):
             """
             Called when game state changes.
             This is the core event - we receive updates in real-time.
@@ -88,50 +134,103 @@ class WebSocketPokerAgent:
             if payload_game_id and payload_game_id != self.game_id:
                 return
 
-            game_state = data.get('gameState', {})
-            
             if not self.game_started:
-                print("🎲 Game started! Receiving updates...")
+                logger.info("🎲 Game started! Receiving updates...")
                 self.game_started = True
+                self.game_started_event.set()
             
-            # Identify our player if we haven't yet
-            if self.my_player_id is None:
-                self.identify_my_player(game_state)
-            
-            # Check if it's our turn
-            if self.is_my_turn(game_state):
-                self.handle_my_turn(game_state)
+            self._pending_state = data.get('gameState', {})
+            if self._pending_handle is None:
+                self._pending_handle = asyncio.get_running_loop().call_later(
+                    self.STATE_COALESCE_SECONDS, self._schedule_flush
+                )
         
         @self.sio.on('action_result')
-        def on_action_result(data):
+        async def on_action_result(data):
             """Called when our action is processed"""
             if data.get('success'):
-                print(f"✅ Action accepted: {data.get('action')}")
+                logger.info("✅ Action accepted: %s", data.get('action'))
             else:
-                print(f"❌ Action rejected: {data.get('error', 'Unknown error')}")
+                logger.warning("❌ Action rejected: %s", data.get('error', 'Unknown error'))
+                # Let the next update for this turn retry
+                self._acted_turn = None
         
         @self.sio.on('error')
-        def on_error(data):
+        async def on_error(data):
             """Called when an error occurs"""
-            print(f"❌ Server error: {data}")
+            logger.warning("❌ Server error: %s", data)
         
         @self.sio.on('player_joined')
-        def on_player_joined(data):
+        async def on_player_joined(data):
             """Called when a player joins"""
-            player_name = data.get('playerName', 'Unknown')
-            print(f"👤 Player joined: {player_name}")
+            logger.info("👤 Player joined: %s", data.get('playerName', 'Unknown'))
         
         @self.sio.on('player_left')
-        def on_player_left(data):
+        async def on_player_left(data):
             """Called when a player leaves"""
-            player_name = data.get('playerName', 'Unknown')
-            print(f"👋 Player left: {player_name}")
+            logger.info("👋 Player left: %s", data.get('playerName', 'Unknown'))
         
         @self.sio.on('hand_complete')
-        def on_hand_complete(data):
+        async def on_hand_complete(data):
             """Called when a hand finishes"""
-            winner = data.get('winner', {})
-            print(f"🏆 Hand complete! Winner: {winner.get('playerName')} - Won: {winner.get('amount')}")
+            self.last_hand = data
+            self._acted_turn = None
+            for winner in data.get('winners', []):
+                logger.info("🏆 Hand complete! Winner: %s - Won: %s", winner.get('username'), winner.get('amount'))
+            self.hand_done.set()
+    
+    def _schedule_flush(self):
+        """Timer callback: run the flush as a task on the client's loop"""
+        self._pending_handle = None
+        if self._flushing:
+            # The running flush drains _pending_state before it exits
+            return
+        self._flushing = True
+        self.sio.start_background_task(self._flush_state)
+    
+    async def _flush_state(self):
+        """Act on the most recent game state received since the last flush"""
+        try:
+            while self._pending_state is not None:
+                game_state = self._pending_state
+                self._pending_state = None
+                await self._act_on_state(game_state)
+        finally:
+            self._flushing = False
+    
+    async def _act_on_state(self, game_state: dict):
+        # Identify our player if we haven't yet
+        if self.my_player_id is None:
+            self.identify_my_player(game_state)
+        self._refresh_my_index(game_state.get('players', []))
+        
+        # Check if it's our turn
+        if not self.is_my_turn(game_state):
+            return
+        
+        turn = self._turn_key(game_state)
+        if turn == self._acted_turn:
+            logger.debug("Already acted on this turn, ignoring repeated update")
+            return
+        self._acted_turn = turn
+        await self.handle_my_turn(game_state)
+    
+    def _turn_key(self, game_state: dict) -> tuple:
+        """
+        Identify a turn by the state our action would change: acting moves
+        our bet or stack, the pot, or the stage, so a later turn of ours
+        never has the same key as the one we already answered.
+        """
+        me = game_state.get('players', [])[self._my_index]
+        return (
+            game_state.get('dealerIndex'),
+            game_state.get('stage'),
+            len(game_state.get('communityCards') or ()),
+            game_state.get('pot'),
+            game_state.get('currentBet'),
+            me.get('currentBet'),
+            me.get('stack'),
+        )
     
     def identify_my_player(self, game_state: dict):
         """
@@ -146,9 +245,10 @@ class WebSocketPokerAgent:
             player_id = str(player.get('id', ''))
             if player_id.startswith(f'player_{self.user_id}_'):
                 self.my_player_id = player_id
-                player_name = player.get('name', 'Unknown')
-                stack = player.get('stack', 0)
-                print(f"🆔 Identified myself by user id: {player_name} (ID: {self.my_player_id}, Stack: {stack})")
+                logger.info(
+                    "🆔 Identified myself by user id: %s (ID: %s, Stack: %s)",
+                    player.get('name', 'Unknown'), self.my_player_id, player.get('stack', 0)
+                )
                 return
 
         # Fallback for legacy payload shapes.
@@ -161,33 +261,36 @@ class WebSocketPokerAgent:
                 first_card = hole_cards[0]
                 if isinstance(first_card, dict) and 'suit' in first_card:
                     self.my_player_id = player.get('id')
-                    player_name = player.get('name', 'Unknown')
-                    stack = player.get('stack', 0)
-                    print(f"🆔 Identified myself by hole cards: {player_name} (ID: {self.my_player_id}, Stack: {stack})")
+                    logger.info(
+                        "🆔 Identified myself by hole cards: %s (ID: %s, Stack: %s)",
+                        player.get('name', 'Unknown'), self.my_player_id, player.get('stack', 0)
+                    )
                     return
     
+    def _refresh_my_index(self, players: list):
+        """Recompute our position in the players list when seating changes"""
+        player_ids = tuple(player.get('id') for player in players)
+        if player_ids == self._player_ids and self._my_index is not None:
+            return
+        self._player_ids = player_ids
+        try:
+            self._my_index = player_ids.index(self.my_player_id)
+        except ValueError:
+            self._my_index = None
+    
     def is_my_turn(self, game_state: dict) -> bool:
         """Check if it's currently our turn to act"""
-        if self.my_player_id is None:
+        if self._my_index is None:
             return False
         
-        current_player_index = game_state.get('currentPlayerIndex')
-        if current_player_index is None:
-            return False
-        
-        players = game_state.get('players', [])
-        if not (0 <= current_player_index < len(players)):
-            return False
-        
-        current_player = players[current_player_index]
-        is_my_turn = current_player.get('id') == self.my_player_id
+        is_my_turn = game_state.get('currentPlayerIndex') == self._my_index
         
         if is_my_turn:
-            print(f"\n🎯 It's my turn! Current pot: {game_state.get('pot', 0)}")
+            logger.info("🎯 It's my turn! Current pot: %s", game_state.get('pot', 0))
         
         return is_my_turn
     
-    def handle_my_turn(self, game_state: dict):
+    async def handle_my_turn(self, game_state: dict):
         """
         Decide what action to take and emit it.
         This is called when it's our turn.
@@ -198,15 +301,12 @@ class WebSocketPokerAgent:
         community_cards = game_state.get('communityCards', [])
         
         # Find my player info
-        my_player = None
-        for player in game_state.get('players', []):
-            if player.get('id') == self.my_player_id:
-                my_player = player
-                break
+        players = game_state.get('players', [])
+        my_player = players[self._my_index] if self._my_index is not None else None
         
         if not my_player:
-            print("❌ Could not find my player info!")
-            self.sio.emit('game_action', {'action': 'fold'})
+            logger.error("❌ Could not find my player info!")
+            await self.sio.emit('game_action', self._ACTION_PAYLOADS['fold'])
             return
         
         # Get my situation
@@ -216,14 +316,12 @@ class WebSocketPokerAgent:
         amount_to_call = current_bet - my_current_bet
         
         # Log situation
-        print(f"💭 Thinking...")
-        print(f"   My stack: {my_stack}")
-        print(f"   Current bet: {current_bet}")
-        print(f"   My bet: {my_current_bet}")
-        print(f"   To call: {amount_to_call}")
-        print(f"   Pot: {pot}")
-        print(f"   My cards: {self.format_cards(my_hole_cards)}")
-        print(f"   Community: {self.format_cards(community_cards)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "💭 Thinking... stack=%s current_bet=%s my_bet=%s to_call=%s pot=%s cards=%s community=%s",
+                my_stack, current_bet, my_current_bet, amount_to_call, pot,
+                self.format_cards(my_hole_cards), self.format_cards(community_cards)
+            )
         
         # Decide action using simple strategy
         action_type, amount = self.decide_action(
@@ -236,16 +334,17 @@ class WebSocketPokerAgent:
         )
         
         # Emit the action
-        action_data = {'action': action_type}
-        if amount is not None:
-            action_data['amount'] = amount
+        if amount is None:
+            action_data = self._ACTION_PAYLOADS.get(action_type) or {'action': action_type}
+        else:
+            action_data = {'action': action_type, 'amount': amount}
 
         if self.action_delay_seconds > 0:
-            print(f"⏱️  Test delay: waiting {self.action_delay_seconds:.1f}s before action...")
-            time.sleep(self.action_delay_seconds)
+            logger.info("⏱️  Test delay: waiting %.1fs before action...", self.action_delay_seconds)
+            await asyncio.sleep(self.action_delay_seconds)
 
-        print(f"🎲 Taking action: {action_type}" + (f" (amount: {amount})" if amount else ""))
-        self.sio.emit('game_action', action_data)
+        logger.info("🎲 Taking action: %s%s", action_type, f" (amount: {amount})" if amount else "")
+        await self.sio.emit('game_action', action_data)
     
     def decide_action(
         self,
@@ -291,9 +390,7 @@ class WebSocketPokerAgent:
             if isinstance(card, dict):
                 rank = card.get('rank', '?')
                 suit = card.get('suit', '?')
-                # Use suit symbols
-                suit_symbol = {'hearts': '♥', 'diamonds': '♦', 'clubs': '♣', 'spades': '♠'}.get(suit, suit)
-                formatted.append(f"{rank}{suit_symbol}")
+                formatted.append(f"{rank}{self._SUIT_SYMBOLS.get(suit, suit)}")
             else:
                 formatted.append(str(card))
         
@@ -304,47 +401,73 @@ class WebSocketPokerAgent:
         Main entry point - connect to server and start playing.
         This will block until disconnected.
         """
-        try:
-            print(f"🤖 WebSocket Poker Agent starting...")
-            print(f"   Server: {self.server_url}")
-            print(f"   Game ID: {self.game_id}")
-            if self.table_id is not None:
-                print(f"   Table ID: {self.table_id}")
-            print(f"   User ID: {self.user_id}")
-            print(f"\n🔌 Connecting...")
+        loop_factory = uvloop.new_event_loop if uvloop is not None else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            self._loop = runner.get_loop()
+            try:
+                runner.run(self.connect_and_play_async())
+            except socketio.exceptions.ConnectionError as e:
+                logger.error("❌ Failed to connect to game server: %s", e)
+                logger.error("   Make sure the game server is running on port 3000")
+                sys.exit(1)
+            except KeyboardInterrupt:
+                logger.info("👋 Agent shutting down...")
+                if self.connected:
+                    runner.run(self.sio.disconnect())
+                sys.exit(0)
+            except Exception as e:
+                logger.exception("❌ Unexpected error: %s", e)
+                sys.exit(1)
+            finally:
+                self._loop = None
 
-            # Connect with JWT authentication
-            auth_payload = {
-                'token': self.token,
-                'gameId': self.game_id,
-            }
-            if self.table_id is not None:
-                auth_payload['tableId'] = self.table_id
+    async def connect_and_play_async(self):
+        """
+        Connect and handle events until disconnected.
+        Use this instead of connect_and_play() to run several agents in one event loop.
+        """
+        await self.connect_async()
 
-            self.sio.connect(
-                self.server_url,
-                auth=auth_payload,
-                wait_timeout=10
-            )
-            
-            # Wait for events (blocks forever)
-            print("👂 Listening for game events...\n")
-            self.sio.wait()
-            
-        except socketio.exceptions.ConnectionError as e:
-            print(f"\n❌ Failed to connect to game server: {e}")
-            print("   Make sure the game server is running on port 3000")
-            sys.exit(1)
-        except KeyboardInterrupt:
-            print("\n\n👋 Agent shutting down...")
-            if self.connected:
-                self.sio.disconnect()
-            sys.exit(0)
-        except Exception as e:
-            print(f"\n❌ Unexpected error: {e}")
-            import traceback
-            traceback.print_exc()
-            sys.exit(1)
+        # Wait for events (blocks until disconnected)
+        logger.info("👂 Listening for game events...")
+        await self.sio.wait()
+
+    async def connect_async(self):
+        """
+        Connect and authenticate, returning once the server has accepted the
+        connection. Events are handled in the background until disconnected.
+        """
+        logger.info("🤖 WebSocket Poker Agent starting...")
+        logger.info("   Server: %s", self.server_url)
+        logger.info("   Game ID: %s", self.game_id)
+        if self.table_id is not None:
+            logger.info("   Table ID: %s", self.table_id)
+        logger.info("   User ID: %s", self.user_id)
+        logger.info("🔌 Connecting...")
+
+        # Connect with JWT authentication
+        auth_payload = {
+            'token': self.token,
+            'gameId': self.game_id,
+        }
+        if self.table_id is not None:
+            auth_payload['tableId'] = self.table_id
+
+        await self.sio.connect(
+            self.server_url,
+            auth=auth_payload,
+            wait_timeout=10
+        )
+
+    def disconnect(self, timeout: float = 5.0):
+        """
+        Disconnect from another thread while connect_and_play() is running.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        future = asyncio.run_coroutine_threadsafe(self.sio.disconnect(), loop)
+        future.result(timeout=timeout)
 
     @staticmethod
     def _extract_table_id(game_id: str) -> Optional[int]:
@@ -368,6 +491,8 @@ def main():
     )
     
     args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper(), format='%(message)s')
     
     # Create and run agent
     agent = WebSocketPokerAgent(
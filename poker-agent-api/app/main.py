@@ -4,17 +4,25 @@ Poker Agent API - Main Application
 This service provides REST API endpoints for autonomous poker agents.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Header
+from fastapi import FastAPI, HTTPException, Depends, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
-import requests
+from cachetools import TTLCache
+from jose import JWTError, jwt
+import asyncio
+import hashlib
+import httpx
+import orjson
 import os
+import time
 
 app = FastAPI(
     title="Poker Agent API",
     description="REST API for autonomous poker agents to play poker",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration
@@ -30,6 +38,59 @@ app.add_middleware(
 FASTAPI_AUTH_URL = os.getenv("FASTAPI_AUTH_URL", "http://localhost:8000")
 GAME_SERVER_URL = os.getenv("GAME_SERVER_URL", "http://localhost:3000")
 
+UPSTREAM_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=128)
+# Connection failures are retried by the transport; requests that reached the
+# game server are never replayed, so actions cannot be applied twice
+UPSTREAM_CONNECT_RETRIES = 2
+
+# State streams re-check the game server on the internal network and only
+# forward changes, so agents no longer poll the public API. Checks start at
+# the minimum interval after a change and back off to the maximum while the
+# state is idle, so an idle stream costs no more than the 2 s polling it
+# replaced.
+STATE_STREAM_MIN_CHECK_INTERVAL_SECONDS = float(os.getenv("STATE_STREAM_MIN_CHECK_INTERVAL_SECONDS", "0.25"))
+STATE_STREAM_MAX_CHECK_INTERVAL_SECONDS = float(os.getenv("STATE_STREAM_MAX_CHECK_INTERVAL_SECONDS", "2.0"))
+STATE_STREAM_KEEPALIVE_SECONDS = 15.0
+
+# With the auth service's signing secret, forged or expired tokens are
+# rejected in-process before the auth service is asked. The auth service call
+# is still made, since only it knows about bans, deleted users and test
+# partitions.
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
+
+# Verified tokens are remembered briefly so each agent call skips the auth
+# round trip; this TTL bounds how long a ban or account deletion can lag
+TOKEN_CACHE_TTL_SECONDS = 60
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+
+def _build_upstream_client(base_url: str, timeout: float) -> httpx.AsyncClient:
+    """Create a pooled keep-alive client for one upstream service"""
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        headers={"Connection": "keep-alive"},
+        transport=httpx.AsyncHTTPTransport(
+            limits=UPSTREAM_LIMITS,
+            retries=UPSTREAM_CONNECT_RETRIES,
+        ),
+    )
+
+
+@app.on_event("startup")
+async def on_startup() -> None:
+    # Shared clients so upstream connections are kept alive across requests
+    app.state.auth_client = _build_upstream_client(FASTAPI_AUTH_URL, timeout=5.0)
+    app.state.game_client = _build_upstream_client(GAME_SERVER_URL, timeout=10.0)
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await app.state.auth_client.aclose()
+    await app.state.game_client.aclose()
+
+
 # Request/Response Models
 class ActionRequest(BaseModel):
     action: str  # fold, check, call, bet, raise, all-in
@@ -48,10 +109,71 @@ class ErrorResponse(BaseModel):
     error: str
     message: Optional[str] = None
 
+
+def _token_cache_key(token: str) -> bytes:
+    """Hash the token so raw JWTs are not used as cache keys"""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    """The token's exp claim, or None when it has none"""
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        return None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+def _token_cache_deadline(token: str) -> float:
+    """Cache until the TTL elapses or the token expires, whichever is first"""
+    deadline = time.time() + TOKEN_CACHE_TTL_SECONDS
+    exp = _token_expiry(token)
+    return deadline if exp is None else min(deadline, exp)
+
+
+def _agent_user(user_id, username) -> dict:
+    """Build the user dict handed to endpoints; `id` is the game server user id"""
+    if not user_id or not username:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return {"id": user_id, "user_id": user_id, "username": username}
+
+
+def _precheck_token_locally(token: str) -> None:
+    """
+    Reject tokens with a bad signature, expiry or missing claims using the
+    shared signing secret, without calling the auth service
+    """
+    try:
+        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    _agent_user(payload.get("user_id"), payload.get("username"))
+
+
+async def _verify_token_remotely(token: str) -> dict:
+    """Verify the token by calling the auth service"""
+    try:
+        response = await app.state.auth_client.post(
+            "/api/internal/auth/verify",
+            json={"token": token}
+        )
+    except httpx.RequestError as e:
+        raise HTTPException(status_code=503, detail=f"Auth service unavailable: {str(e)}")
+
+    if response.status_code != 200:
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    result = orjson.loads(response.content)
+    if not result.get("valid"):
+        raise HTTPException(status_code=401, detail="Invalid or expired token")
+    return _agent_user(result.get("user_id"), result.get("username"))
+
+
 # Authentication dependency
 async def verify_token(authorization: Optional[str] = Header(None)) -> dict:
     """
-    Verify JWT token by calling the auth service
+    Verify JWT token through the auth service, which also checks bans,
+    account existence and test partitions. When JWT_SECRET_KEY is configured,
+    invalid tokens are rejected locally first.
     Returns user data if valid, raises HTTPException if invalid
     """
     if not authorization:
@@ -61,23 +183,22 @@ async def verify_token(authorization: Optional[str] = Header(None)) -> dict:
         raise HTTPException(status_code=401, detail="Invalid Authorization header format")
     
     token = authorization.replace("Bearer ", "")
-    
-    try:
-        # Verify token with auth service
-        response = requests.post(
-            f"{FASTAPI_AUTH_URL}/api/internal/auth/verify",
-            json={"token": token},
-            timeout=5
-        )
-        
-        if response.status_code == 200:
-            user_data = response.json()
+    cache_key = _token_cache_key(token)
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None:
+        deadline, user_data = cached
+        if deadline > time.time():
             return user_data
-        else:
-            raise HTTPException(status_code=401, detail="Invalid or expired token")
+        _TOKEN_CACHE.pop(cache_key, None)
     
-    except requests.exceptions.RequestException as e:
-        raise HTTPException(status_code=503, detail=f"Auth service unavailable: {str(e)}")
+    if JWT_SECRET_KEY:
+        _precheck_token_locally(token)
+    user_data = await _verify_token_remotely(token)
+    
+    deadline = _token_cache_deadline(token)
+    if deadline > time.time():
+        _TOKEN_CACHE[cache_key] = (deadline, user_data)
+    return user_data
 
 # Health check
 @app.get("/health")
@@ -89,46 +210,133 @@ async def health_check():
         "version": "1.0.0"
     }
 
-# Get game state
-@app.get("/api/v1/game/{game_id}/state", response_model=GameStateResponse)
-async def get_game_state(
-    game_id: str,
-    user: dict = Depends(verify_token)
-):
+async def _fetch_game_state(game_id: str, user_id) -> httpx.Response:
     """
-    Get the current game state from the agent's perspective.
-    
-    This endpoint polls the game server for the current state.
-    Agents should call this repeatedly to wait for their turn.
+    Fetch the agent's view of a game from the game server.
+    Returns the upstream response on success, raises HTTPException otherwise.
     """
     try:
-        user_id = user.get("id")
-        
         # Call internal game server endpoint
-        response = requests.get(
-            f"{GAME_SERVER_URL}/_internal/game/{game_id}/state",
-            params={"userId": user_id},
-            timeout=10
+        response = await app.state.game_client.get(
+            f"/_internal/game/{game_id}/state",
+            params={"userId": user_id}
         )
-        
-        if response.status_code == 200:
-            return response.json()
-        elif response.status_code == 404:
-            raise HTTPException(status_code=404, detail="Game not found")
-        else:
-            raise HTTPException(
-                status_code=response.status_code,
-                detail=response.json().get("error", "Failed to get game state")
-            )
-    
-    except requests.exceptions.RequestException as e:
+    except httpx.RequestError as e:
         raise HTTPException(
             status_code=503,
             detail=f"Game server unavailable: {str(e)}"
         )
 
+    if response.status_code == 200:
+        return response
+    elif response.status_code == 404:
+        raise HTTPException(status_code=404, detail="Game not found")
+    else:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=orjson.loads(response.content).get("error", "Failed to get game state")
+        )
+
+
+def _sse_event(event: str, data: bytes) -> bytes:
+    """Encode a single Server-Sent Events frame"""
+    return b"event: " + event.encode() + b"\ndata: " + data + b"\n\n"
+
+
+# Get game state
+# The state is an opaque passthrough, so the model documents the response
+# without FastAPI re-validating the nested dict on every call
+@app.get("/api/v1/game/{game_id}/state", responses={200: {"model": GameStateResponse}})
+async def get_game_state(
+    game_id: str,
+    user: dict = Depends(verify_token),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get the current game state from the agent's perspective.
+    
+    This endpoint returns a single snapshot of the game state.
+    Agents that need continuous updates should use the state stream.
+    Pollers can send the previous ETag in If-None-Match to get a 304
+    while the state is unchanged.
+    """
+    response = await _fetch_game_state(game_id, user.get("id"))
+    etag = f'"{hashlib.blake2b(response.content, digest_size=12).hexdigest()}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    # Upstream body is already JSON; forward it without parsing
+    return Response(content=response.content, media_type="application/json", headers={"ETag": etag})
+
+# Stream game state
+@app.get("/api/v1/game/{game_id}/state/stream")
+async def stream_game_state(
+    game_id: str,
+    request: Request,
+    authorization: Optional[str] = Header(None),
+    user: dict = Depends(verify_token)
+):
+    """
+    Stream the game state as Server-Sent Events.
+    
+    A `state` event is sent immediately and then again only when the state
+    changes, so agents react to their turn without polling. Comment lines are
+    sent periodically to keep idle connections open. If the game server
+    becomes unavailable an `error` event is sent and the stream ends; clients
+    should reconnect.
+    
+    The token is re-verified as the stream runs, so the stream also ends with
+    an `error` event once the token expires or the user is banned.
+    """
+    user_id = user.get("id")
+    token = authorization.replace("Bearer ", "")
+    token_expires_at = _token_expiry(token)
+    # Fail fast with a normal HTTP error if the game or player is unknown
+    initial = await _fetch_game_state(game_id, user_id)
+
+    async def event_stream():
+        last_body = initial.content
+        last_sent = time.monotonic()
+        interval = STATE_STREAM_MIN_CHECK_INTERVAL_SECONDS
+        reverify_at = _token_cache_deadline(token)
+        yield _sse_event("state", last_body)
+
+        while not await request.is_disconnected():
+            await asyncio.sleep(interval)
+            now = time.time()
+            if token_expires_at is not None and now >= token_expires_at:
+                yield _sse_event("error", orjson.dumps({"error": "Token expired"}))
+                return
+            try:
+                if now >= reverify_at:
+                    # Re-confirm with the auth service so bans and account
+                    # deletion end the stream too
+                    await verify_token(authorization)
+                    reverify_at = _token_cache_deadline(token)
+                response = await _fetch_game_state(game_id, user_id)
+            except HTTPException as e:
+                yield _sse_event("error", orjson.dumps({"error": e.detail}))
+                return
+
+            if response.content != last_body:
+                last_body = response.content
+                last_sent = time.monotonic()
+                interval = STATE_STREAM_MIN_CHECK_INTERVAL_SECONDS
+                yield _sse_event("state", last_body)
+                continue
+
+            interval = min(interval * 2, STATE_STREAM_MAX_CHECK_INTERVAL_SECONDS)
+            if time.monotonic() - last_sent >= STATE_STREAM_KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield b": keep-alive\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
 # Perform action
-@app.post("/api/v1/game/{game_id}/action", response_model=ActionResponse)
+@app.post("/api/v1/game/{game_id}/action", responses={200: {"model": ActionResponse}})
 async def perform_action(
     game_id: str,
     action_request: ActionRequest,
@@ -171,17 +379,17 @@ async def perform_action(
             payload["amount"] = action_request.amount
         
         # Call internal game server endpoint
-        response = requests.post(
-            f"{GAME_SERVER_URL}/_internal/agent-action",
+        response = await app.state.game_client.post(
+            "/_internal/agent-action",
             json=payload,
             timeout=30  # Longer timeout for action processing
         )
         
         if response.status_code == 200:
-            return response.json()
+            return Response(content=response.content, media_type="application/json")
         elif response.status_code == 400:
             # Invalid action
-            error_data = response.json()
+            error_data = orjson.loads(response.content)
             raise HTTPException(
                 status_code=400,
                 detail=error_data.get("error", "Invalid action")
@@ -191,15 +399,15 @@ async def perform_action(
         else:
             raise HTTPException(
                 status_code=response.status_code,
-                detail=response.json().get("error", "Failed to perform action")
+                detail=orjson.loads(response.content).get("error", "Failed to perform action")
             )
     
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         raise HTTPException(
             status_code=504,
             detail="Game server timeout - action may still be processing"
         )
-    except requests.exceptions.RequestException as e:
+    except httpx.RequestError as e:
         raise HTTPException(
             status_code=503,
             detail=f"Game server unavailable: {str(e)}"
@@ -208,10 +416,15 @@ async def perform_action(
 # Error handler for unexpected errors
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    return {
-        "error": "Internal server error",
-        "message": str(exc)
-    }
+    # Clients retrying on 5xx back off briefly instead of hammering the service
+    return ORJSONResponse(
+        status_code=500,
+        content={
+            "error": "Internal server error",
+            "message": str(exc)
+        },
+        headers={"Retry-After": "1"},
+    )
 
 if __name__ == "__main__":
     import uvicorn
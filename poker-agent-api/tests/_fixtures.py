@@ -0,0 +1,182 @@
+"""
+Shared helpers for the manual end-to-end test scripts in this directory.
+"""
+
+import base64
+import functools
+import os
+import time
+
+import httpx
+import orjson
+
+AUTH_API_URL = "http://localhost:8000"
+TEST_PASSWORD = "testpass123"
+# Read the clock once per run; every generated name derives from it
+RUN_TS = int(time.time())
+
+# One keep-alive connection pool shared by every client in a test run.
+# uvicorn only speaks HTTP/1.1 and httpx negotiates HTTP/2 over TLS only,
+# so calls share pooled connections rather than HTTP/2 streams.
+TRANSPORT = httpx.HTTPTransport(
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    retries=3
+)
+SESSION = httpx.Client(transport=TRANSPORT, timeout=30)
+
+# Set POKER_TEST_VERBOSE=0 to drop section banners from CI logs
+VERBOSE = os.getenv("POKER_TEST_VERBOSE", "1") == "1"
+
+
+def banner(title: str, ch: str = "=", width: int = 60):
+    """Print a section banner, preceded by a blank line, unless VERBOSE is off"""
+    if VERBOSE:
+        rule = ch * width
+        print(f"\n{rule}\n{title}\n{rule}")
+
+
+def user_session(token: str) -> httpx.Client:
+    """Client that sends a user's bearer token and shares SESSION's connection pool"""
+    return httpx.Client(
+        transport=TRANSPORT,
+        timeout=30,
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+def extract_user_id(token: str) -> int:
+    """Read user_id from a JWT payload without verifying it (the server already did)"""
+    payload = token.split('.')[1]
+    payload += '=' * (-len(payload) % 4)
+    return orjson.loads(base64.urlsafe_b64decode(payload))["user_id"]
+
+
+def jget(response) -> object:
+    """Decode a response body with orjson"""
+    return orjson.loads(response.content)
+
+
+def make_credentials(prefix: str, count: int) -> list:
+    """Pre-generate username/email/password bundles for players 1..count"""
+    credentials = []
+    for i in range(1, count + 1):
+        username = f"{prefix}_{RUN_TS}_p{i}"
+        credentials.append({
+            "username": username,
+            "email": f"{username}@test.com",
+            "password": TEST_PASSWORD
+        })
+    return credentials
+
+
+def token_for(session: httpx.Client, username: str, password: str) -> str:
+    """
+    Log in a user that was just registered and return its access token.
+    Raises httpx.HTTPStatusError if login fails.
+    """
+    response = session.post(
+        f"{AUTH_API_URL}/auth/login",
+        params={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return jget(response)["access_token"]
+
+
+def setup_admin(session: httpx.Client) -> dict:
+    """Register and log in a fresh setup user; returns its auth headers"""
+    username = f"admin_{RUN_TS}"
+    response = session.post(
+        f"{AUTH_API_URL}/auth/register",
+        json={"username": username, "password": TEST_PASSWORD, "email": f"{username}@test.com"}
+    )
+    response.raise_for_status()
+    token = token_for(session, username, TEST_PASSWORD)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def make_league(session: httpx.Client, headers: dict, name: str) -> int:
+    """Create a league and return its id"""
+    response = session.post(
+        f"{AUTH_API_URL}/api/leagues",
+        headers=headers,
+        json={"name": name, "description": "Manual test league"}
+    )
+    response.raise_for_status()
+    return jget(response)["id"]
+
+
+def make_community(
+    session: httpx.Client,
+    headers: dict,
+    league_id: int,
+    name: str,
+    starting_balance: int = 10000
+) -> int:
+    """Create a community in a league and return its id"""
+    response = session.post(
+        f"{AUTH_API_URL}/api/communities",
+        headers=headers,
+        json={
+            "name": name,
+            "description": "Manual test community",
+            "league_id": league_id,
+            "starting_balance": starting_balance
+        }
+    )
+    response.raise_for_status()
+    return jget(response)["id"]
+
+
+def make_table(
+    session: httpx.Client,
+    headers: dict,
+    community_id: int,
+    name: str,
+    *,
+    small_blind: int,
+    big_blind: int,
+    buy_in: int,
+    max_seats: int = 6
+) -> dict:
+    """Create a cash table in a community and return it"""
+    response = session.post(
+        f"{AUTH_API_URL}/api/communities/{community_id}/tables",
+        headers=headers,
+        json={
+            "name": name,
+            "game_type": "cash",
+            "max_seats": max_seats,
+            "small_blind": small_blind,
+            "big_blind": big_blind,
+            "buy_in": buy_in
+        }
+    )
+    response.raise_for_status()
+    return jget(response)
+
+
+@functools.lru_cache(maxsize=None)
+def make_infrastructure(session: httpx.Client) -> dict:
+    """
+    Setup admin, league and community, created once per process.
+    Tables are not shared; each test creates its own with make_table.
+    """
+    headers = setup_admin(session)
+    league_id = make_league(session, headers, f"Test League {RUN_TS}")
+    community_id = make_community(session, headers, league_id, f"Test Community {RUN_TS}")
+    return {"headers": headers, "league_id": league_id, "community_id": community_id}
+
+
+@functools.lru_cache(maxsize=None)
+def db_pool():
+    """Connection pool to the compose Postgres, created on first use"""
+    # Imported lazily: only the database checks need a Postgres driver
+    from psycopg2.pool import SimpleConnectionPool
+    return SimpleConnectionPool(
+        1, 4,
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        port=int(os.getenv("POSTGRES_HOST_PORT", "5432")),
+        user="poker_user",
+        password=os.getenv("POSTGRES_PASSWORD", "poker_dev_password"),
+        dbname="poker_db"
+    )
@@ -3,183 +3,164 @@
 Play a complete hand and verify hand history recording
 """
 
-import requests
+import asyncio
 import sys
 import time
-import threading
-from jose import jwt
-from agent_websocket import WebSocketPokerAgent
+from concurrent.futures import ThreadPoolExecutor
+from _fixtures import (
+    AUTH_API_URL,
+    RUN_TS,
+    SESSION,
+    banner,
+    db_pool,
+    extract_user_id,
+    jget,
+    make_credentials,
+    make_infrastructure,
+    make_table,
+    token_for,
+    user_session,
+)
 
 # Configuration
-AUTH_API_URL = "http://localhost:8000"
 GAME_SERVER_URL = "http://localhost:3000"
 
 def test_complete_hand():
     """Play a complete hand with two bots"""
     
-    print("=" * 80)
-    print("COMPLETE HAND TEST - WITH HAND HISTORY VERIFICATION")
-    print("=" * 80)
+    banner("COMPLETE HAND TEST - WITH HAND HISTORY VERIFICATION", "=", 80)
     print()
     
-    # Create admin user for setup
-    timestamp = int(time.time())
-    username1 = f"admin_{timestamp}"
-    password = "testpass123"
-    
-    print("📝 Creating admin user...")
-    requests.post(
-        f"{AUTH_API_URL}/auth/register",
-        json={"username": username1, "password": password, "email": f"{username1}@test.com"}
-    )
-    
-    # Login
-    login_response = requests.post(
-        f"{AUTH_API_URL}/auth/login",
-        params={"username": username1, "password": password}
-    )
-    
-    token = login_response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Create league
-    print("🏆 Creating league...")
-    league_response = requests.post(
-        f"{AUTH_API_URL}/api/leagues",
-        headers=headers,
-        json={
-            "name": f"Test League {timestamp}",
-            "description": "Complete hand test"
-        }
-    )
-    league_id = league_response.json()["id"]
-    
-    # Create community
-    print("🏘️  Creating community...")
-    community_response = requests.post(
-        f"{AUTH_API_URL}/api/communities",
-        headers=headers,
-        json={
-            "name": f"Test Community {timestamp}",
-            "description": "Complete hand test",
-            "league_id": league_id,
-            "starting_balance": 10000
-        }
-    )
-    community_id = community_response.json()["id"]
+    # Shared setup admin, league and community
+    print("🏘️  Preparing league and community...")
+    infra = make_infrastructure(SESSION)
+    community_id = infra["community_id"]
     
     # Create table
     print("🎲 Creating poker table...")
-    table_response = requests.post(
-        f"{AUTH_API_URL}/api/communities/{community_id}/tables",
-        headers=headers,
-        json={
-            "name": f"Complete Hand Test {timestamp}",
-            "game_type": "cash",
-            "max_seats": 6,
-            "small_blind": 5,
-            "big_blind": 10,
-            "buy_in": 500
-        }
+    table = make_table(
+        SESSION,
+        infra["headers"],
+        community_id,
+        f"Complete Hand Test {RUN_TS}",
+        small_blind=5,
+        big_blind=10,
+        buy_in=500
     )
-    table_id = table_response.json()["id"]
+    table_id = table["id"]
     game_id = f"table_{table_id}"
     print(f"✅ Table created (ID: {table_id}, Game ID: {game_id})")
     print()
     
-    # Create two players
-    players = []
-    for i in range(1, 3):
-        username = f"bot_{timestamp}_p{i}"
+    # Create two players; register/login/community join run concurrently
+    def create_player(credentials):
+        username = credentials["username"]
         
-        # Register
-        requests.post(
-            f"{AUTH_API_URL}/auth/register",
-            json={"username": username, "password": password, "email": f"{username}@test.com"}
-        )
-        
-        # Login
-        login_resp = requests.post(
-            f"{AUTH_API_URL}/auth/login",
-            params={"username": username, "password": password}
-        )
-        player_token = login_resp.json()["access_token"]
-        player_headers = {"Authorization": f"Bearer {player_token}"}
+        # Register, then log in
+        SESSION.post(f"{AUTH_API_URL}/auth/register", json=credentials)
+        player_token = token_for(SESSION, username, credentials["password"])
         
-        decoded = jwt.decode(player_token, key="", options={"verify_signature": False})
-        user_id = decoded["user_id"]
+        user_id = extract_user_id(player_token)
+        # Authenticated client built once and reused for every later call
+        session = user_session(player_token)
         
         # Join community
-        requests.post(
-            f"{AUTH_API_URL}/api/communities/{community_id}/join",
-            headers=player_headers
-        )
+        session.post(f"{AUTH_API_URL}/api/communities/{community_id}/join")
         
-        # Join table
-        requests.post(
+        return {
+            "username": username,
+            "user_id": user_id,
+            "token": player_token,
+            "session": session
+        }
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        players = list(executor.map(create_player, make_credentials("bot", 2)))
+    
+    # Join table in seat order
+    for i, player in enumerate(players, 1):
+        player["session"].post(
             f"{AUTH_API_URL}/api/tables/{table_id}/join",
-            headers=player_headers,
             json={"buy_in_amount": 500, "seat_number": i}
         )
         
-        players.append({
-            "username": username,
-            "user_id": user_id,
-            "token": player_token
-        })
-        
-        print(f"✅ Created player {i}: {username} (User ID: {user_id})")
+        print(f"✅ Created player {i}: {player['username']} (User ID: {player['user_id']})")
     
     print()
     print("🎮 Starting game agents...")
     print()
     
     # Create agents
-    agents = []
-    threads = []
-    
-    for i, player in enumerate(players, 1):
-        agent = WebSocketPokerAgent(
+    # Imported here so collecting/listing these scripts skips socketio/aiohttp
+    from agent_websocket import WebSocketPokerAgent
+    agents = [
+        WebSocketPokerAgent(
             server_url=GAME_SERVER_URL,
             token=player["token"],
             game_id=game_id,
             user_id=player["user_id"]
         )
-        agents.append(agent)
-        
-        def run_agent(a, num):
-            print(f"🤖 Player {num} ({player['username']}) connecting...")
-            try:
-                a.connect_and_play()
-            except Exception as e:
-                print(f"❌ Player {num} error: {e}")
-        
-        thread = threading.Thread(target=run_agent, args=(agent, i), daemon=True)
-        threads.append(thread)
-        thread.start()
+        for player in players
+    ]
+    
+    async def run_agent(agent, num):
+        print(f"🤖 Player {num} ({players[num - 1]['username']}) connecting...")
+        try:
+            await agent.connect_and_play_async()
+        except Exception as e:
+            print(f"❌ Player {num} error: {e}")
+    
+    async def play_hand():
+        """Run every agent in this event loop until each has seen a hand complete"""
+        tasks = [asyncio.create_task(run_agent(agent, num)) for num, agent in enumerate(agents, 1)]
+        try:
+            done = await asyncio.gather(
+                *(asyncio.to_thread(agent.hand_done.wait, 60) for agent in agents)
+            )
+            return all(done)
+        finally:
+            for agent in agents:
+                if agent.connected:
+                    await agent.sio.disconnect()
+            await asyncio.gather(*tasks, return_exceptions=True)
     
     # Wait for game to complete
-    print("⏳ Waiting for hand to complete (60 seconds)...")
-    time.sleep(60)
-    
-    print()
-    print("=" * 80)
-    print("CHECKING HAND HISTORY")
-    print("=" * 80)
+    print("⏳ Waiting for hand to complete (up to 60 seconds)...")
+    if asyncio.run(play_hand()):
+        print("🏁 Hand complete")
+        # Hand history is persisted just after hand_complete is broadcast
+        time.sleep(1)
+    else:
+        print("⚠️  Timed out waiting for hand to complete")
+    
+    banner("CHECKING HAND HISTORY", "=", 80)
     print()
     
-    # Check hand history for both players
-    for i, player in enumerate(players, 1):
-        print(f"📜 Checking hand history for Player {i} ({player['username']})...")
-        headers = {"Authorization": f"Bearer {player['token']}"}
-        resp = requests.get(
-            f"{AUTH_API_URL}/api/me/hands",
-            headers=headers,
-            params={"limit": 10}
+    # The hand result arrived over the WebSocket; report it from memory
+    last_hand = next((agent.last_hand for agent in agents if agent.last_hand), None)
+    if last_hand:
+        winners = ", ".join(
+            f"{winner.get('username')} (+{winner.get('amount')})" for winner in last_hand.get("winners", [])
         )
+        print("🃏 Hand result (from hand_complete event):")
+        print(f"   Pot: {last_hand.get('totalPot')} chips")
+        print(f"   Winners: {winners or 'none'}")
+        print(f"   Ended by fold: {last_hand.get('endedByFold')}")
+        print()
+    
+    # REST is only used to confirm persistence: one history call per player, concurrently
+    with ThreadPoolExecutor(max_workers=len(players)) as executor:
+        histories = list(executor.map(
+            lambda player: player["session"].get(f"{AUTH_API_URL}/api/me/hands", params={"limit": 10}),
+            players
+        ))
+    
+    # Report in player order
+    for i, (player, resp) in enumerate(zip(players, histories), 1):
+        print(f"📜 Checking hand history for Player {i} ({player['username']})...")
         
         if resp.status_code == 200:
-            hands = resp.json()
+            hands = jget(resp)
             print(f"   ✅ Found {len(hands)} hands")
             
             if len(hands) > 0:
@@ -191,16 +172,6 @@ def test_complete_hand():
                 print(f"      Pot: {hand['pot_size']} chips")
                 if hand.get('winner_username'):
                     print(f"      Winner: {hand['winner_username']}")
-                
-                # Get full details
-                detail_resp = requests.get(
-                    f"{AUTH_API_URL}/api/hands/{hand['id']}",
-                    headers=headers
-                )
-                if detail_resp.status_code == 200:
-                    details = detail_resp.json()
-                    hand_data = details["hand_data"]
-                    print(f"      Community Cards: {hand_data.get('community_cards', [])}")
             else:
                 print(f"   ⚠️  No hands recorded yet")
         else:
@@ -210,18 +181,16 @@ def test_complete_hand():
     
     # Check database directly
     print("🗄️  Checking database...")
-    import subprocess
-    result = subprocess.run(
-        ["docker", "exec", "poker-postgres", "psql", "-U", "poker_user", "-d", "poker_db", 
-         "-c", "SELECT COUNT(*) as total FROM hand_history;"],
-        capture_output=True,
-        text=True
-    )
-    print(result.stdout)
+    pool = db_pool()
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*) FROM hand_history")
+            print(f"   Total hands recorded: {cur.fetchone()[0]}")
+    finally:
+        pool.putconn(conn)
     
-    print("=" * 80)
-    print("TEST COMPLETE")
-    print("=" * 80)
+    banner("TEST COMPLETE", "=", 80)
     
     return True
 
@@ -4,9 +4,20 @@ Test script for seat selection feature
 Tests that players can choose their seats and turn order follows seat numbers
 """
 
-import requests
-import time
+import httpx
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from _fixtures import (
+    SESSION,
+    banner,
+    extract_user_id,
+    jget,
+    make_credentials,
+    make_infrastructure,
+    make_table,
+    token_for,
+    user_session,
+)
 
 BASE_URL = "http://localhost:8000"
 API_URL = f"{BASE_URL}/api"
@@ -22,7 +33,7 @@ def register_and_login(username: str, password: str):
     }
     
     try:
-        response = requests.post(f"{AUTH_URL}/register", json=register_data)
+        response = SESSION.post(f"{AUTH_URL}/register", json=register_data)
         if response.status_code == 201:
             print(f"✅ Registered {username}")
         elif response.status_code == 400 and "already exists" in response.text.lower():
@@ -35,128 +46,67 @@ def register_and_login(username: str, password: str):
         return None
     
     # Login
-    login_data = {
-        "username": username,
-        "password": password
-    }
-    
     try:
-        response = requests.post(f"{AUTH_URL}/login", params=login_data)
-        if response.status_code == 200:
-            token = response.json()["access_token"]
-            # Decode the token to get user_id (simple base64 decode of JWT payload)
-            import json
-            import base64
-            payload_part = token.split('.')[1]
-            # Add padding if needed
-            padding = 4 - len(payload_part) % 4
-            if padding != 4:
-                payload_part += '=' * padding
-            payload = json.loads(base64.urlsafe_b64decode(payload_part))
-            user_id = payload["user_id"]
-            print(f"✅ Logged in as {username} (ID: {user_id})")
-            return {"token": token, "user_id": user_id, "username": username}
-        else:
-            print(f"❌ Login failed: {response.text}")
-            return None
+        token = token_for(SESSION, username, password)
+    except httpx.HTTPStatusError as e:
+        print(f"❌ Login failed: {e.response.text}")
+        return None
     except Exception as e:
         print(f"❌ Login error: {e}")
         return None
-
-
-def create_infrastructure(token):
-    """Create league, community, and table"""
-    # Create league
-    league_data = {
-        "name": f"Test League {int(time.time())}",
-        "description": "Seat selection test"
-    }
-    
-    response = requests.post(
-        f"{API_URL}/leagues",
-        json=league_data,
-        params={"token": token}
-    )
-    
-    if response.status_code != 201:
-        print(f"❌ Failed to create league: {response.text}")
-        return None
-    
-    league_id = response.json()["id"]
-    print(f"✅ Created league (ID: {league_id})")
-    
-    # Create community
-    community_data = {
-        "name": "Test Community",
-        "description": "For seat testing",
-        "league_id": league_id,
-        "starting_balance": 10000
-    }
-    
-    response = requests.post(
-        f"{API_URL}/communities",
-        json=community_data,
-        params={"token": token}
-    )
-    
-    if response.status_code != 201:
-        print(f"❌ Failed to create community: {response.text}")
-        return None
-    
-    community_id = response.json()["id"]
-    print(f"✅ Created community (ID: {community_id})")
     
-    # Create table with 6 seats
-    table_data = {
-        "name": "Seat Test Table",
-        "game_type": "cash",
-        "max_seats": 6,
-        "small_blind": 10,
-        "big_blind": 20,
-        "buy_in": 1000
+    user_id = extract_user_id(token)
+    print(f"✅ Logged in as {username} (ID: {user_id})")
+    return {
+        "token": token,
+        "user_id": user_id,
+        "username": username,
+        "session": user_session(token)
     }
-    
-    response = requests.post(
-        f"{API_URL}/communities/{community_id}/tables",
-        json=table_data,
-        params={"token": token}
-    )
-    
-    if response.status_code != 201:
-        print(f"❌ Failed to create table: {response.text}")
+
+
+def create_infrastructure():
+    """Reuse the shared league and community, and create a fresh 6-seat table"""
+    try:
+        infra = make_infrastructure(SESSION)
+        print(f"✅ Using league {infra['league_id']}, community {infra['community_id']}")
+        table = make_table(
+            SESSION,
+            infra["headers"],
+            infra["community_id"],
+            "Seat Test Table",
+            small_blind=10,
+            big_blind=20,
+            buy_in=1000
+        )
+    except httpx.HTTPError as e:
+        print(f"❌ Failed to create infrastructure: {e}")
         return None
     
-    table = response.json()
     table_id = table["id"]
     print(f"✅ Created table (ID: {table_id}, Max seats: {table['max_seats']})")
     
     return {
-        "league_id": league_id,
-        "community_id": community_id,
+        "league_id": infra["league_id"],
+        "community_id": infra["community_id"],
         "table_id": table_id
     }
 
 
-def get_available_seats(table_id, token):
+def get_available_seats(table_id, session):
     """Get list of available seats"""
-    response = requests.get(
-        f"{API_URL}/tables/{table_id}/seats",
-        params={"token": token}
-    )
+    response = session.get(f"{API_URL}/tables/{table_id}/seats")
     
     if response.status_code == 200:
-        return response.json()
+        return jget(response)
     else:
         print(f"❌ Failed to get seats: {response.text}")
         return None
 
 
-def join_community(community_id, user_token):
+def join_community(community_id, session):
     """Join a community to get a wallet"""
-    response = requests.post(
-        f"{API_URL}/communities/{community_id}/join",
-        params={"token": user_token}
-    )
+    response = session.post(f"{API_URL}/communities/{community_id}/join")
     
     if response.status_code in [200, 201]:
         print(f"✅ Joined community {community_id}")
@@ -166,17 +116,16 @@ def join_community(community_id, user_token):
         return False
 
 
-def join_table(table_id, seat_number, user_token, buy_in_amount=1000):
+def join_table(table_id, seat_number, session, buy_in_amount=1000):
     """Join a table at a specific seat"""
     join_data = {
         "buy_in_amount": buy_in_amount,
         "seat_number": seat_number
     }
     
-    response = requests.post(
+    response = session.post(
         f"{API_URL}/tables/{table_id}/join",
-        json=join_data,
-        params={"token": user_token}
+        json=join_data
     )
     
     if response.status_code == 200:
@@ -188,106 +137,92 @@ def join_table(table_id, seat_number, user_token, buy_in_amount=1000):
 
 
 def main():
-    print("=" * 60)
-    print("Seat Selection Test")
-    print("=" * 60)
+    banner("Seat Selection Test")
     print()
     
-    # Create 4 test players
-    players = []
-    for i in range(1, 5):
-        username = f"seat_player_{i}_{int(time.time())}"
-        password = "testpass123"
-        
-        print(f"\n{'='*60}")
-        print(f"Player {i} Setup")
-        print(f"{'='*60}")
-        
-        user = register_and_login(username, password)
+    # Create 4 seated test players plus an idle one for the seat-conflict
+    # check; their register/login flows are independent
+    banner("Player Setup")
+    
+    def setup_player(credentials):
+        return register_and_login(credentials["username"], credentials["password"])
+    
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        users = list(executor.map(setup_player, make_credentials("seat_player", 5)))
+    
+    for i, user in enumerate(users, 1):
         if not user:
             print(f"❌ Failed to setup player {i}")
             return 1
-        
-        players.append(user)
+    players, idle_player = users[:4], users[4]
     
-    # Use first player to create infrastructure
-    print(f"\n{'='*60}")
-    print("Creating Game Infrastructure")
-    print(f"{'='*60}")
+    # Create the table (league and community are shared fixtures)
+    banner("Creating Game Infrastructure")
     
-    infra = create_infrastructure(players[0]["token"])
+    infra = create_infrastructure()
     if not infra:
         print("❌ Failed to create infrastructure")
         return 1
     
     # All players join community
-    print(f"\n{'='*60}")
-    print("Players Joining Community")
-    print(f"{'='*60}")
-    
-    for player in players:
-        if not join_community(infra["community_id"], player["token"]):
-            return 1
+    banner("Players Joining Community")
+    
+    with ThreadPoolExecutor(max_workers=len(users)) as executor:
+        joined = list(executor.map(
+            lambda user: join_community(infra["community_id"], user["session"]),
+            users
+        ))
+    if not all(joined):
+        return 1
     
     # Check available seats
-    print(f"\n{'='*60}")
-    print("Available Seats (Before Joining)")
-    print(f"{'='*60}")
+    banner("Available Seats (Before Joining)")
     
-    seats = get_available_seats(infra["table_id"], players[0]["token"])
+    seats = get_available_seats(infra["table_id"], players[0]["session"])
     if seats:
-        for seat in seats:
-            status = f"Occupied by {seat['username']}" if seat['user_id'] else "Available"
-            print(f"  Seat {seat['seat_number']}: {status}")
+        sys.stdout.write("".join(
+            f"  Seat {seat['seat_number']}: "
+            + (f"Occupied by {seat['username']}" if seat['user_id'] else "Available") + "\n"
+            for seat in seats
+        ))
     
     # Players choose seats: 1, 3, 5, 6 (NOT sequential!)
-    print(f"\n{'='*60}")
-    print("Players Selecting Seats")
-    print(f"{'='*60}")
+    banner("Players Selecting Seats")
     
     seat_choices = [1, 3, 5, 6]  # Non-sequential to test turn order
     
     for i, player in enumerate(players):
         seat_num = seat_choices[i]
         print(f"\n{player['username']} choosing seat {seat_num}...")
-        if not join_table(infra["table_id"], seat_num, player["token"]):
+        if not join_table(infra["table_id"], seat_num, player["session"]):
             return 1
     
     # Check seats again
-    print(f"\n{'='*60}")
-    print("Seat Occupancy (After Joining)")
-    print(f"{'='*60}")
+    banner("Seat Occupancy (After Joining)")
     
-    seats = get_available_seats(infra["table_id"], players[0]["token"])
+    seats = get_available_seats(infra["table_id"], players[0]["session"])
     if seats:
-        for seat in seats:
-            if seat['user_id']:
-                print(f"  Seat {seat['seat_number']}: ✅ {seat['username']}")
-            else:
-                print(f"  Seat {seat['seat_number']}: ⬜ Available")
+        sys.stdout.write("".join(
+            f"  Seat {seat['seat_number']}: "
+            + (f"✅ {seat['username']}" if seat['user_id'] else "⬜ Available") + "\n"
+            for seat in seats
+        ))
     
     # Test: Try to take an occupied seat
-    print(f"\n{'='*60}")
-    print("Testing Seat Conflict (Expected to Fail)")
-    print(f"{'='*60}")
+    banner("Testing Seat Conflict (Expected to Fail)")
     
-    duplicate_player = register_and_login(f"duplicate_{int(time.time())}", "testpass123")
-    if duplicate_player:
-        join_community(infra["community_id"], duplicate_player["token"])
-        print("\nAttempting to take seat 3 (already occupied)...")
-        join_table(infra["table_id"], 3, duplicate_player["token"])
+    # A seated player asking for another seat trips the double-join check
+    # first, so an unseated player is needed to reach the occupied-seat check
+    print(f"\n{idle_player['username']} attempting to take seat 3 (already occupied)...")
+    join_table(infra["table_id"], 3, idle_player["session"])
     
     # Test: Try to join same table twice
-    print(f"\n{'='*60}")
-    print("Testing Double Join (Expected to Fail)")
-    print(f"{'='*60}")
+    banner("Testing Double Join (Expected to Fail)")
     
     print(f"\n{players[0]['username']} attempting to join again...")
-    join_table(infra["table_id"], 2, players[0]["token"])
+    join_table(infra["table_id"], 2, players[0]["session"])
     
-    print(f"\n{'='*60}")
-    print("✅ Test Complete!")
-    print(f"{'='*60}")
+    banner("✅ Test Complete!")
     print("\n📊 Summary:")
     print(f"  - Created table with 6 seats")
     print(f"  - 4 players selected seats: {seat_choices}")
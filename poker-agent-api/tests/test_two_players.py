@@ -6,34 +6,44 @@ This test creates two bot accounts, seats them at the same table,
 and connects both via WebSocket to verify the game starts automatically.
 """
 
-import requests
+import asyncio
+import httpx
 import sys
-import time
 import threading
-from jose import jwt
-from agent_websocket import WebSocketPokerAgent
+import time
+from _fixtures import (
+    AUTH_API_URL,
+    RUN_TS,
+    SESSION,
+    banner,
+    extract_user_id,
+    make_credentials,
+    make_infrastructure,
+    make_table,
+    token_for,
+)
 
 # Configuration
-AUTH_API_URL = "http://localhost:8000"
 GAME_SERVER_URL = "http://localhost:3000"
 
-def create_and_join_player(player_num: int, table_id: int, community_id: int, game_id: str):
+def create_and_join_player(
+    player_num: int,
+    credentials: dict,
+    table_id: int,
+    community_id: int,
+    game_id: str,
+    game_started_event: threading.Event,
+    session: httpx.Client = SESSION
+):
     """Create a player, join the table, and connect via WebSocket"""
     
-    print(f"\n{'='*60}")
-    print(f"Player {player_num} Setup")
-    print('='*60)
+    banner(f"Player {player_num} Setup")
     
     # Register
-    username = f"bot_player_{player_num}_{int(time.time())}"
-    password = "testpass123"
-    email = f"{username}@test.com"
+    username = credentials["username"]
     
     print(f"📝 Registering {username}...")
-    register_response = requests.post(
-        f"{AUTH_API_URL}/auth/register",
-        json={"username": username, "password": password, "email": email}
-    )
+    register_response = session.post(f"{AUTH_API_URL}/auth/register", json=credentials)
     
     if register_response.status_code != 201:
         print(f"❌ Failed to register: {register_response.text}")
@@ -41,18 +51,13 @@ def create_and_join_player(player_num: int, table_id: int, community_id: int, ga
     
     # Login
     print(f"🔐 Logging in...")
-    login_response = requests.post(
-        f"{AUTH_API_URL}/auth/login",
-        params={"username": username, "password": password}
-    )
-    
-    if login_response.status_code != 200:
-        print(f"❌ Failed to login: {login_response.text}")
+    try:
+        token = token_for(session, username, credentials["password"])
+    except httpx.HTTPStatusError as e:
+        print(f"❌ Failed to login: {e.response.text}")
         return None
     
-    token = login_response.json()["access_token"]
-    decoded = jwt.decode(token, key="", options={"verify_signature": False})
-    user_id = decoded["user_id"]
+    user_id = extract_user_id(token)
     
     print(f"✅ Logged in (User ID: {user_id})")
     
@@ -60,7 +65,7 @@ def create_and_join_player(player_num: int, table_id: int, community_id: int, ga
     
     # Join community
     print(f"💰 Joining community...")
-    join_response = requests.post(
+    join_response = session.post(
         f"{AUTH_API_URL}/api/communities/{community_id}/join",
         headers=headers
     )
@@ -71,7 +76,7 @@ def create_and_join_player(player_num: int, table_id: int, community_id: int, ga
     
     # Join table
     print(f"💵 Joining table {table_id} at seat {player_num}...")
-    join_table_response = requests.post(
+    join_table_response = session.post(
         f"{AUTH_API_URL}/api/tables/{table_id}/join",
         headers=headers,
         json={"buy_in_amount": 500, "seat_number": player_num}
@@ -84,11 +89,14 @@ def create_and_join_player(player_num: int, table_id: int, community_id: int, ga
     print(f"✅ Joined table successfully")
     
     # Create and connect WebSocket agent
+    # Imported here so collecting/listing these scripts skips socketio/aiohttp
+    from agent_websocket import WebSocketPokerAgent
     agent = WebSocketPokerAgent(
         token=token,
         game_id=game_id,
         user_id=user_id,
-        server_url=GAME_SERVER_URL
+        server_url=GAME_SERVER_URL,
+        game_started_event=game_started_event
     )
     
     return agent
@@ -96,123 +104,84 @@ def create_and_join_player(player_num: int, table_id: int, community_id: int, ga
 def test_two_players():
     """Test game starting with two players"""
     
-    print("\n" + "="*60)
-    print("Two Player Game Start Test")
-    print("="*60)
+    banner("Two Player Game Start Test")
     
     # Create initial setup (league, community, table)
     print("\n📋 Setting up game environment...")
     
-    # Register and login first player to create infrastructure
-    username1 = f"setup_bot_{int(time.time())}"
-    password = "testpass123"
-    email1 = f"{username1}@test.com"
-    
-    register_response = requests.post(
-        f"{AUTH_API_URL}/auth/register",
-        json={"username": username1, "password": password, "email": email1}
-    )
-    
-    if register_response.status_code != 201:
-        print(f"❌ Failed to register setup user: {register_response.text}")
+    # Shared setup admin, league and community
+    try:
+        infra = make_infrastructure(SESSION)
+    except httpx.HTTPError as e:
+        print(f"❌ Failed to set up league and community: {e}")
         return False
-    
-    login_response = requests.post(
-        f"{AUTH_API_URL}/auth/login",
-        params={"username": username1, "password": password}
-    )
-    
-    token = login_response.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    
-    # Create league
-    print("🏆 Creating league...")
-    league_response = requests.post(
-        f"{AUTH_API_URL}/api/leagues",
-        headers=headers,
-        json={
-            "name": f"Test League {int(time.time())}",
-            "description": "Two player test"
-        }
-    )
-    league_id = league_response.json()["id"]
-    print(f"✅ League created (ID: {league_id})")
-    
-    # Create community
-    print("🏘️  Creating community...")
-    community_response = requests.post(
-        f"{AUTH_API_URL}/api/communities",
-        headers=headers,
-        json={
-            "name": f"Test Community {int(time.time())}",
-            "description": "Two player test",
-            "league_id": league_id,
-            "starting_balance": 10000
-        }
-    )
-    community_id = community_response.json()["id"]
-    print(f"✅ Community created (ID: {community_id})")
+    community_id = infra["community_id"]
+    print(f"✅ Using league {infra['league_id']}, community {community_id}")
     
     # Create table
     print("🎲 Creating poker table...")
-    table_response = requests.post(
-        f"{AUTH_API_URL}/api/communities/{community_id}/tables",
-        headers=headers,
-        json={
-            "name": f"Two Player Test {int(time.time())}",
-            "game_type": "cash",
-            "max_seats": 6,
-            "small_blind": 5,
-            "big_blind": 10,
-            "buy_in": 500
-        }
+    table = make_table(
+        SESSION,
+        infra["headers"],
+        community_id,
+        f"Two Player Test {RUN_TS}",
+        small_blind=5,
+        big_blind=10,
+        buy_in=500
     )
-    table_id = table_response.json()["id"]
+    table_id = table["id"]
     game_id = f"table_{table_id}"
     print(f"✅ Table created (ID: {table_id}, Game ID: {game_id})")
     
     # Create two players
     print("\n🤖 Creating and connecting two players...")
     
-    agent1 = create_and_join_player(1, table_id, community_id, game_id)
+    credentials = make_credentials("bot_player", 2)
+    game_started_event = threading.Event()
+    
+    agent1 = create_and_join_player(1, credentials[0], table_id, community_id, game_id, game_started_event)
     if not agent1:
         return False
     
-    agent2 = create_and_join_player(2, table_id, community_id, game_id)
+    agent2 = create_and_join_player(2, credentials[1], table_id, community_id, game_id, game_started_event)
     if not agent2:
         return False
     
-    # Connect both agents in threads
+    # Connect both agents, multiplexed in one event loop
     print("\n🔌 Connecting both agents to game server...")
     
-    def connect_agent(agent, player_num):
+    async def connect_agent(agent, player_num):
         print(f"🤖 Player {player_num} connecting...")
         try:
-            agent.connect_and_play()
+            await agent.connect_and_play_async()
         except Exception as e:
             print(f"❌ Player {player_num} error: {e}")
     
-    thread1 = threading.Thread(target=connect_agent, args=(agent1, 1), daemon=True)
-    thread2 = threading.Thread(target=connect_agent, args=(agent2, 2), daemon=True)
-    
-    thread1.start()
-    time.sleep(1)  # Stagger connections slightly
-    thread2.start()
-    
-    # Wait for connections and game to start
-    print("\n⏳ Waiting 10 seconds for game to start...")
-    for i in range(10):
-        time.sleep(1)
-        if agent1.game_started or agent2.game_started:
-            print(f"🎲 Game started after {i+1} seconds!")
-            break
+    async def watch_game_start():
+        """Run both agents until the game starts; returns their connection flags"""
+        tasks = [
+            asyncio.create_task(connect_agent(agent, num))
+            for num, agent in ((1, agent1), (2, agent2))
+        ]
+        try:
+            # Wait for connections and game to start
+            print("\n⏳ Waiting 10 seconds for game to start...")
+            started_at = time.monotonic()
+            if await asyncio.to_thread(game_started_event.wait, 10):
+                print(f"🎲 Game started after {time.monotonic() - started_at:.1f} seconds!")
+            return agent1.connected, agent2.connected
+        finally:
+            for agent in (agent1, agent2):
+                if agent.connected:
+                    await agent.sio.disconnect()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    connected1, connected2 = asyncio.run(watch_game_start())
     
     # Check results
-    print("\n" + "="*60)
-    print("Test Results")
-    print("="*60)
+    banner("Test Results")
     
-    if agent1.connected and agent2.connected:
+    if connected1 and connected2:
         print("✅ Both agents connected successfully")
         
         if agent1.game_started or agent2.game_started:
@@ -228,8 +197,8 @@ def test_two_players():
             return False
     else:
         print(f"❌ Connection failed:")
-        print(f"   Player 1: {'connected' if agent1.connected else 'not connected'}")
-        print(f"   Player 2: {'connected' if agent2.connected else 'not connected'}")
+        print(f"   Player 1: {'connected' if connected1 else 'not connected'}")
+        print(f"   Player 2: {'connected' if connected2 else 'not connected'}")
         return False
 
 if __name__ == '__main__':
@@ -10,34 +10,75 @@ This script tests the new WebSocket-based agent by:
 5. Connecting the WebSocket agent
 6. Simulating game actions
 
-Run this after starting all services (Docker or manual).
+Run this after starting all services (Docker or manual). With ADMIN_USERNAME
+and ADMIN_PASSWORD set and the server's test fixture API enabled, steps 1-4
+run as a single fixture API call.
 """
 
-import requests
+import asyncio
+import os
 import sys
 import time
-from jose import jwt
 from agent_websocket import WebSocketPokerAgent
+from _fixtures import AUTH_API_URL, RUN_TS, SESSION, extract_user_id, user_session
 
 # Configuration
-AUTH_API_URL = "http://localhost:8000"
 GAME_SERVER_URL = "http://localhost:3000"
 
-def test_websocket_agent():
-    """Complete end-to-end test of WebSocket agent"""
+def seed_via_fixture_api():
+    """
+    Provision the user, league, community, wallet and a seated table in one
+    request through the admin fixture API. Needs ENABLE_TEST_FIXTURE_API on the
+    server and ADMIN_USERNAME/ADMIN_PASSWORD in the environment.
+    Returns (token, user_id, table_id, game_id), or None when unavailable.
+    """
+    admin_username = os.getenv("ADMIN_USERNAME")
+    admin_password = os.getenv("ADMIN_PASSWORD")
+    if not admin_username or not admin_password:
+        return None
     
-    print("=" * 60)
-    print("WebSocket Agent End-to-End Test")
-    print("=" * 60)
-    print()
+    print("🧪 Seeding test stack via the fixture API...")
+    login_response = SESSION.post(
+        f"{AUTH_API_URL}/auth/login",
+        params={"username": admin_username, "password": admin_password}
+    )
+    if login_response.status_code != 200 or "access_token" not in login_response.json():
+        print(f"⚠️  Admin login failed, falling back to step-by-step setup: {login_response.text}")
+        return None
+    
+    seed_response = user_session(login_response.json()["access_token"]).post(
+        f"{AUTH_API_URL}/api/admin/test-fixtures/gameplay-stack",
+        json={
+            "run_tag": f"ws-agent-{RUN_TS}",
+            "player_count": 2,
+            "starting_balance": 10000,
+            "buy_in": 500,
+            "small_blind": 5,
+            "big_blind": 10,
+            "max_seats": 2
+        }
+    )
+    if seed_response.status_code != 201:
+        print(f"⚠️  Fixture API unavailable, falling back to step-by-step setup: {seed_response.text}")
+        return None
     
+    stack = seed_response.json()
+    player = stack["users"][0]
+    print(f"✅ Seeded {player['username']} at table {stack['table_id']} (run {stack['run_tag']})")
+    return player["access_token"], player["user_id"], stack["table_id"], stack["game_id"]
+
+def setup_via_public_api():
+    """
+    Register, log in, and create and join a league, community and table one
+    request at a time. Returns (token, user_id, table_id, game_id) or None.
+    """
     # Step 1: Register user
     print("📝 Step 1: Registering test user...")
     username = f"bot_test_{int(time.time())}"
     password = "testpass123"  # Min 8 characters
     email = f"{username}@test.com"
     
-    register_response = requests.post(
+    register_response = SESSION.post(
         f"{AUTH_API_URL}/auth/register",
         json={
             "username": username,
@@ -48,13 +89,13 @@ def test_websocket_agent():
     
     if register_response.status_code != 201:
         print(f"❌ Failed to register: {register_response.text}")
-        return False
+        return None
     
     print(f"✅ User registered: {username}")
     
     # Step 2: Login
     print("\n🔐 Step 2: Logging in...")
-    login_response = requests.post(
+    login_response = SESSION.post(
         f"{AUTH_API_URL}/auth/login",
         params={
             "username": username,
@@ -64,21 +105,22 @@ def test_websocket_agent():
     
     if login_response.status_code != 200:
         print(f"❌ Failed to login: {login_response.text}")
-        return False
+        return None
     
     token = login_response.json()["access_token"]
     
-    # Decode token to get user_id (no key verification needed for testing)
-    decoded = jwt.decode(token, key="", options={"verify_signature": False})
-    user_id = decoded["user_id"]
+    # Read user_id straight from the token payload (the server verified it)
+    user_id = extract_user_id(token)
     
     print(f"✅ Logged in (User ID: {user_id})")
     
+    # Every later call reuses one keep-alive client carrying the bearer token
+    client = user_session(token)
+    
     # Step 3: Create league
     print("\n🏆 Step 3: Creating league...")
-    league_response = requests.post(
+    league_response = client.post(
         f"{AUTH_API_URL}/api/leagues",
-        params={"token": token},
         json={
             "name": f"Test League {int(time.time())}",
             "description": "Test league for WebSocket agent"
@@ -87,16 +129,15 @@ def test_websocket_agent():
     
     if league_response.status_code != 201:
         print(f"❌ Failed to create league: {league_response.text}")
-        return False
+        return None
     
     league_id = league_response.json()["id"]
     print(f"✅ League created (ID: {league_id})")
     
     # Step 4: Create community
     print("\n🏘️  Step 4: Creating community...")
-    community_response = requests.post(
+    community_response = client.post(
         f"{AUTH_API_URL}/api/communities",
-        params={"token": token},
         json={
             "name": f"Test Community {int(time.time())}",
             "description": "Test community for WebSocket agent",
@@ -107,30 +148,26 @@ def test_websocket_agent():
     
     if community_response.status_code != 201:
         print(f"❌ Failed to create community: {community_response.text}")
-        return False
+        return None
     
     community_id = community_response.json()["id"]
     print(f"✅ Community created (ID: {community_id})")
     
     # Step 5: Join community (creates wallet)
     print("\n💰 Step 5: Joining community (creates wallet)...")
-    join_response = requests.post(
-        f"{AUTH_API_URL}/api/communities/{community_id}/join",
-        params={"token": token}
-    )
+    join_response = client.post(f"{AUTH_API_URL}/api/communities/{community_id}/join")
     
     if join_response.status_code != 200:
         print(f"❌ Failed to join community: {join_response.text}")
-        return False
+        return None
     
     wallet_balance = join_response.json()["balance"]
     print(f"✅ Joined community (Wallet balance: {wallet_balance})")
     
     # Step 6: Create table
     print("\n🎲 Step 6: Creating poker table...")
-    table_response = requests.post(
+    table_response = client.post(
         f"{AUTH_API_URL}/api/communities/{community_id}/tables",
-        params={"token": token},
         json={
             "name": f"WebSocket Test Table {int(time.time())}",
             "game_type": "cash",
@@ -143,7 +180,7 @@ def test_websocket_agent():
     
     if table_response.status_code != 201:
         print(f"❌ Failed to create table: {table_response.text}")
-        return False
+        return None
     
     table_id = table_response.json()["id"]
     game_id = f"game-{table_id}"
@@ -151,19 +188,33 @@ def test_websocket_agent():
     
     # Step 7: Join table with buy-in
     print("\n💵 Step 7: Joining table with buy-in...")
-    join_table_response = requests.post(
+    join_table_response = client.post(
         f"{AUTH_API_URL}/api/tables/{table_id}/join",
-        params={"token": token},
         json={"buy_in_amount": 500}
     )
     
     if join_table_response.status_code != 200:
         print(f"❌ Failed to join table: {join_table_response.text}")
-        return False
+        return None
     
     new_balance = join_table_response.json()["new_balance"]
     print(f"✅ Joined table (New wallet balance: {new_balance})")
     
+    return token, user_id, table_id, game_id
+
+def test_websocket_agent():
+    """Complete end-to-end test of WebSocket agent"""
+    
+    print("=" * 60)
+    print("WebSocket Agent End-to-End Test")
+    print("=" * 60)
+    print()
+    
+    seeded = seed_via_fixture_api() or setup_via_public_api()
+    if not seeded:
+        return False
+    token, user_id, table_id, game_id = seeded
+    
     # Step 8: Connect WebSocket agent
     print("\n🤖 Step 8: Testing WebSocket connection...")
     print("=" * 60)
@@ -177,19 +228,21 @@ def test_websocket_agent():
             server_url=GAME_SERVER_URL
         )
         
-        # Connect in a separate thread to test connection
-        import threading
-        def connect_agent():
-            agent.connect_and_play()
-        
-        agent_thread = threading.Thread(target=connect_agent, daemon=True)
-        agent_thread.start()
+        # Connect in an event loop and return as soon as the server accepts
+        async def verify_connection():
+            try:
+                await asyncio.wait_for(agent.connect_async(), timeout=5)
+            except asyncio.TimeoutError:
+                return False
+            connected = agent.connected
+            if connected:
+                await agent.sio.disconnect()
+            return connected
         
-        # Wait 5 seconds to see if connection works
-        print("⏳ Waiting 5 seconds to verify connection...")
-        time.sleep(5)
+        print("⏳ Waiting up to 5 seconds to verify connection...")
+        connected = asyncio.run(verify_connection())
         
-        if agent.connected:
+        if connected:
             print("\n✅ SUCCESS! WebSocket agent:")
             print("   ✓ Connected to game server")
             print("   ✓ Authenticated successfully") 
@@ -1,11 +1,20 @@
 """
 Authentication utilities for JWT token handling and password hashing
 """
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from threading import Lock
+import time
 from jose import JWTError, jwt
 import bcrypt
 from .config import settings
 
+# Verified token payloads keyed by the raw token, evicted least recently used
+# first and dropped once their exp claim has passed
+TOKEN_CACHE_SIZE = 4096
+_token_cache: OrderedDict[str, dict] = OrderedDict()
+_token_cache_lock = Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -36,7 +45,7 @@ def get_password_hash(password: str) -> str:
     """
     # Convert to bytes and hash
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     # Return as string for database storage
     return hashed.decode('utf-8')
@@ -70,14 +79,32 @@ def decode_token(token: str) -> dict | None:
     """
     Decode and verify a JWT token
     
+    Repeat calls with the same token are served from an in-process cache
+    until the token's exp claim passes, skipping the signature check.
+    
     Args:
         token: JWT token to decode
         
     Returns:
         Decoded payload if valid, None if invalid
     """
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+        if payload is not None:
+            if payload.get("exp", 0) > time.time():
+                _token_cache.move_to_end(token)
+                return dict(payload)
+            del _token_cache[token]
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+
+    # Tokens without an exp claim never expire, so they are not cached
+    if isinstance(payload.get("exp"), (int, float)):
+        with _token_cache_lock:
+            _token_cache[token] = payload
+            if len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+    return dict(payload)
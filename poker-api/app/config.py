@@ -2,6 +2,7 @@
 Application configuration using Pydantic settings
 """
 import json
+from functools import lru_cache
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
@@ -12,11 +13,23 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str = "postgresql://trian@localhost:5432/poker_platform"
+    # Connection pool per worker. Pool size plus overflow, times the number of
+    # workers, must stay under Postgres max_connections (100 by default); past
+    # that the server refuses new connections. Sync endpoint threads beyond
+    # the pool wait for a free connection instead.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    # Seconds before a pooled connection is replaced, so connections dropped
+    # by proxies or server-side idle timeouts are not handed out
+    DB_POOL_RECYCLE_SECONDS: int = 1800
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-this-in-production-use-openssl-rand-hex-32"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt cost for new hashes; unset means 12 in production and 10 in dev.
+    # Existing hashes keep verifying at whatever cost they were created with.
+    BCRYPT_ROUNDS: Optional[int] = None
     
     # App
     DEBUG: bool = True
@@ -64,6 +77,19 @@ class Settings(BaseSettings):
     GAME_SERVER_URL: str = "http://game-server:3000"
     ENABLE_TEST_FIXTURE_API: bool = False
 
+    # Schema sync (create_all + pending SQL migrations) on each worker's startup.
+    # Multi-worker deployments can disable this and run
+    # `python -m app.schema_migrations` once per deploy instead.
+    RUN_SCHEMA_MIGRATIONS_ON_STARTUP: bool = True
+
+    # Worker threads for sync endpoints (AnyIO defaults to 40). bcrypt releases
+    # the GIL, so concurrent logins/registrations scale with this pool.
+    SYNC_ENDPOINT_THREADS: int = 40
+
+    # How long the internal table-config endpoint serves a cached row before
+    # re-reading Postgres; 0 disables the cache.
+    TABLE_CONFIG_CACHE_TTL_SECONDS: int = 30
+
     @field_validator("DEBUG", mode="before")
     @classmethod
     def parse_debug_value(cls, value):
@@ -77,6 +103,12 @@ class Settings(BaseSettings):
     def is_production(self) -> bool:
         return self.ENV_MODE.lower() in ("production", "prod")
 
+    @property
+    def bcrypt_rounds(self) -> int:
+        if self.BCRYPT_ROUNDS is not None:
+            return self.BCRYPT_ROUNDS
+        return 12 if self.is_production else 10
+
     @property
     def cors_origins(self) -> list[str]:
         normalized = self.CORS_ORIGINS.strip()
@@ -95,4 +127,10 @@ class Settings(BaseSettings):
     )
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Process-wide settings, parsed from the environment and .env once"""
+    return Settings()
+
+
+settings = get_settings()
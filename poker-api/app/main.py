@@ -1,20 +1,26 @@
 """
 Main FastAPI application with all routes
 """
-from fastapi import FastAPI, Depends, HTTPException, status, Body, Query, Request, Header
+from fastapi import FastAPI, Depends, HTTPException, status, Body, Query, Request, Header, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy import or_, and_, func, text
+from sqlalchemy import Integer, or_, and_, bindparam, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 from decimal import Decimal
+import base64
 import math
 from collections import Counter
 from dataclasses import dataclass
+from functools import partial
 import hashlib
 import re
 import secrets
 import string
+import time
+from threading import Lock
 
 from .config import settings
 from .database import get_db, SessionLocal
@@ -23,7 +29,7 @@ from .models import (
     LeagueAdmin, CommunityAdmin, LeagueMember, LeagueJoinRequest, JoinRequest, InboxMessage,
     Skin, UserSkin, SkinSubmission, SkinSubmissionWorkflowState, DirectMessage, CoinPurchaseIntent,
     CreatorPayoutRequest, CreatorPayoutStatus,
-    TableSession, SessionHand, EmailVerification, TournamentRegistration, TournamentRegistrationStatus,
+    TableSession, SessionHand, HandParticipant, EmailVerification, TournamentRegistration, TournamentRegistrationStatus,
     Tournament, TournamentPayout, FeedbackReport, PlayerNote
     , TestFixtureRun
 )
@@ -60,8 +66,11 @@ from .auth import (
     get_password_hash, verify_password,
     create_access_token, decode_token
 )
+import anyio.from_thread
+import anyio.to_thread
 import httpx
 import logging
+import orjson
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import json
@@ -83,7 +92,8 @@ security = HTTPBearer(auto_error=False)
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
-    description="API for poker platform authentication and wallet management"
+    description="API for poker platform authentication and wallet management",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -94,6 +104,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -107,41 +118,49 @@ def _bootstrap_admin_user() -> None:
 
     db = SessionLocal()
     try:
-        user = db.query(User).filter(
+        # Warm starts only pay for this narrow read; the password is hashed
+        # only when a row is created or ADMIN_RESET_PASSWORD asks for it
+        user = db.query(
+            User.id, User.username, User.is_admin, User.is_active, User.email_verified
+        ).filter(
             or_(User.username == settings.ADMIN_USERNAME, User.email == settings.ADMIN_EMAIL)
         ).first()
 
         if user:
-            updated = False
+            updates = {}
             if not user.is_admin:
-                user.is_admin = True
-                updated = True
+                updates[User.is_admin] = True
             if not user.is_active:
-                user.is_active = True
-                updated = True
+                updates[User.is_active] = True
             if not user.email_verified:
-                user.email_verified = True
-                updated = True
+                updates[User.email_verified] = True
             if settings.ADMIN_RESET_PASSWORD:
-                user.hashed_password = get_password_hash(settings.ADMIN_PASSWORD)
-                updated = True
+                updates[User.hashed_password] = get_password_hash(settings.ADMIN_PASSWORD)
 
-            if updated:
+            if updates:
+                db.query(User).filter(User.id == user.id).update(updates, synchronize_session=False)
                 db.commit()
                 logger.info("Admin user updated: %s", user.username)
             return
 
-        new_user = User(
-            username=settings.ADMIN_USERNAME,
-            email=settings.ADMIN_EMAIL,
-            hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
-            is_admin=True,
-            is_active=True,
-            email_verified=True,
-        )
-        db.add(new_user)
+        # Workers booting together may race to create the admin; the loser's
+        # insert becomes a no-op instead of an IntegrityError
+        created_username = db.execute(
+            pg_insert(User)
+            .values(
+                username=settings.ADMIN_USERNAME,
+                email=settings.ADMIN_EMAIL,
+                hashed_password=get_password_hash(settings.ADMIN_PASSWORD),
+                is_admin=True,
+                is_active=True,
+                email_verified=True,
+            )
+            .on_conflict_do_nothing()
+            .returning(User.username)
+        ).scalar()
         db.commit()
-        logger.info("Admin user created: %s", new_user.username)
+        if created_username:
+            logger.info("Admin user created: %s", created_username)
     except Exception:
         db.rollback()
         logger.exception("Failed to bootstrap admin user")
@@ -151,10 +170,18 @@ def _bootstrap_admin_user() -> None:
 
 @app.on_event("startup")
 async def on_startup() -> None:
-    ensure_schema()
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.SYNC_ENDPOINT_THREADS
+    if settings.RUN_SCHEMA_MIGRATIONS_ON_STARTUP:
+        ensure_schema()
     _bootstrap_admin_user()
     if settings.ENABLE_TEST_FIXTURE_API and not settings.is_production:
         logger.warning("Test fixture API is enabled outside production")
+    # One keep-alive pool for every game-server call
+    app.state.game_server_client = httpx.AsyncClient(
+        base_url=settings.GAME_SERVER_URL.rstrip("/"),
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    )
     if settings.G5_ADVISOR_ENABLED:
         app.state.g5_advisor_client = httpx.AsyncClient(
             base_url=settings.G5_ADVISOR_SERVICE_URL.rstrip("/"),
@@ -166,23 +193,30 @@ async def on_startup() -> None:
 
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
-    client = getattr(app.state, "g5_advisor_client", None)
-    if client is not None:
-        await client.aclose()
+    for name in ("g5_advisor_client", "game_server_client"):
+        client = getattr(app.state, name, None)
+        if client is not None:
+            await client.aclose()
+        setattr(app.state, name, None)
 
 
 # ============================================================================
 # Health Check
 # ============================================================================
 
+# Static for the life of the process, so serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "app": settings.APP_NAME,
+    "version": settings.VERSION,
+    "status": "running"
+})
+
+
 @app.get("/")
 def read_root():
     """Health check endpoint"""
-    return {
-        "app": settings.APP_NAME,
-        "version": settings.VERSION,
-        "status": "running"
-    }
+    # A fresh Response per request: middleware appends to its header list
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health")
@@ -266,14 +300,22 @@ async def _get_g5_health_status() -> dict[str, object]:
         "service_status": payload.get("status"),
     }
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
-    token: str | None = None
+    token: str | None = Query(
+        None,
+        deprecated=True,
+        description="Legacy fallback; tokens in URLs end up in access logs. Send an Authorization header instead.",
+    )
 ) -> dict:
     """
     Dependency to get current user from JWT token in Authorization header
     or from a `token` query parameter. Raises HTTPException if token is missing
     or invalid.
+    
+    Declared async so FastAPI resolves it on the event loop rather than a
+    threadpool hop per request; decode_token serves repeat tokens from its
+    cache, so the call rarely does more than a dict lookup.
     """
     access_token = None
     if credentials:
@@ -296,23 +338,32 @@ def get_current_user(
     return payload
 
 
+def _run_on_event_loop(func, *args, **kwargs):
+    """
+    Await a game-server coroutine from a sync endpoint's worker thread.
+
+    Endpoints that mix many ORM queries with game-server calls are plain
+    ``def`` routes so their blocking DB work stays off the event loop; the
+    HTTP calls still run on the loop and share the pooled client.
+    """
+    return anyio.from_thread.run(partial(func, *args, **kwargs))
+
+
+async def _game_server_request(method: str, path: str, timeout: float, **kwargs) -> httpx.Response:
+    client = getattr(app.state, "game_server_client", None)
+    if client is None:
+        # Outside the app lifespan (scripts, bare imports) fall back to a one-off client
+        async with httpx.AsyncClient(base_url=settings.GAME_SERVER_URL.rstrip("/")) as client:
+            return await client.request(method, path, timeout=timeout, **kwargs)
+    return await client.request(method, path, timeout=timeout, **kwargs)
+
+
 async def post_game_server_json(path: str, payload: dict, timeout: float = 10.0) -> httpx.Response:
-    base_url = settings.GAME_SERVER_URL.rstrip("/")
-    async with httpx.AsyncClient() as client:
-        return await client.post(
-            f"{base_url}{path}",
-            json=payload,
-            timeout=timeout,
-        )
+    return await _game_server_request("POST", path, timeout, json=payload)
 
 
 async def get_game_server_json(path: str, timeout: float = 10.0) -> httpx.Response:
-    base_url = settings.GAME_SERVER_URL.rstrip("/")
-    async with httpx.AsyncClient() as client:
-        return await client.get(
-            f"{base_url}{path}",
-            timeout=timeout,
-        )
+    return await _game_server_request("GET", path, timeout)
 
 
 async def rollback_game_server_promotion(promotion_id: str, timeout: float = 3.0) -> httpx.Response:
@@ -368,15 +419,27 @@ def _lock_wallet_for_update(db: Session, user_id: int, community_id: int) -> Wal
 
 
 def _compact_table_queue_positions(db: Session, table_id: int) -> None:
+    """Renumber a table's queue 1..N in one UPDATE, touching only rows that move."""
     db.flush()
-    entries = (
-        db.query(TableQueue)
-        .filter(TableQueue.table_id == table_id)
-        .order_by(TableQueue.position.asc(), TableQueue.joined_at.asc(), TableQueue.id.asc())
-        .all()
+    ranked = (
+        select(
+            TableQueue.id.label("id"),
+            func.row_number().over(
+                order_by=(TableQueue.position.asc(), TableQueue.joined_at.asc(), TableQueue.id.asc())
+            ).label("next_position"),
+        )
+        .where(TableQueue.table_id == table_id)
+        .subquery()
+    )
+    db.execute(
+        update(TableQueue)
+        .where(
+            TableQueue.id == ranked.c.id,
+            TableQueue.position != ranked.c.next_position,
+        )
+        .values(position=ranked.c.next_position)
+        .execution_options(synchronize_session="fetch")
     )
-    for next_position, entry in enumerate(entries, start=1):
-        entry.position = next_position
 
 
 def _occupied_seat_count(db: Session, table_id: int) -> int:
@@ -406,33 +469,28 @@ def _is_community_admin(db: Session, community_id: int, user_id: int) -> bool:
 
 
 def _is_league_member(db: Session, league_id: int, user_id: int) -> bool:
+    # Owner, league admin, community admin or member, checked in one round trip
     owner_match = db.query(League.id).filter(
         League.id == league_id,
         League.owner_id == user_id
-    ).first()
-    if owner_match:
-        return True
-
-    if _is_league_admin(db, league_id, user_id):
-        return True
-
+    ).exists()
+    admin_match = db.query(LeagueAdmin.id).filter(
+        LeagueAdmin.league_id == league_id,
+        LeagueAdmin.user_id == user_id
+    ).exists()
     community_admin_match = db.query(CommunityAdmin.id).join(Community).filter(
         CommunityAdmin.user_id == user_id,
         Community.league_id == league_id
-    ).first()
-    if community_admin_match:
-        return True
-
+    ).exists()
     member_match = db.query(LeagueMember.id).filter(
         LeagueMember.league_id == league_id,
         LeagueMember.user_id == user_id
-    ).first()
-    return member_match is not None
+    ).exists()
+    return bool(db.query(or_(owner_match, admin_match, community_admin_match, member_match)).scalar())
 
 
 def _is_global_admin(db: Session, user_id: int) -> bool:
-    user = db.query(User).filter(User.id == user_id).first()
-    return bool(user and user.is_admin)
+    return bool(db.query(User.is_admin).filter(User.id == user_id).scalar())
 
 
 def _get_user_or_404(db: Session, user_id: int) -> User:
@@ -502,6 +560,16 @@ def _apply_partition_filter(query, model, partition: PartitionContext):
     )
 
 
+def _paginate(query, order_column, limit: int | None, offset: int):
+    """Order a list query by a stable key and apply optional limit/offset"""
+    query = query.order_by(order_column)
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
 def _apply_user_partition_filter(query, partition: PartitionContext):
     if partition.kind == "normal":
         return query.filter(User.is_test_user.is_(False))
@@ -1001,6 +1069,8 @@ def _cleanup_fixture_run_rows(db: Session, run_tag: str) -> dict[str, int]:
             Table.test_run_tag == run_tag,
         )
     )
+    for table_id in table_ids:
+        _invalidate_table_config(table_id)
     counts["communities"] = _delete_query(
         db.query(Community).filter(
             Community.is_test_only.is_(True),
@@ -1092,6 +1162,22 @@ def _require_ui_create_request(
         )
 
 
+# Internal table configs keyed by table id, as (expires_at, payload). The game
+# server polls these far more often than they change; nothing here is mutated
+# after creation, so entries only need dropping when a table is deleted.
+_table_config_cache: dict[int, tuple[float, dict]] = {}
+_table_config_cache_lock = Lock()
+
+
+def _invalidate_table_config(table_id: int | None = None) -> None:
+    """Drop one cached table config, or all of them when no id is given."""
+    with _table_config_cache_lock:
+        if table_id is None:
+            _table_config_cache.clear()
+        else:
+            _table_config_cache.pop(table_id, None)
+
+
 def _detach_hand_history_from_table(db: Session, table_id: int) -> int:
     """
     Preserve historical hands when a table is deleted by nulling table_id links.
@@ -1101,6 +1187,7 @@ def _detach_hand_history_from_table(db: Session, table_id: int) -> int:
         .filter(HandHistory.table_id == table_id)
         .update({HandHistory.table_id: None}, synchronize_session=False)
     )
+    _invalidate_table_config(table_id)
     return int(detached_rows or 0)
 
 
@@ -1114,6 +1201,8 @@ def _prepare_table_deletion_cleanup(db: Session, table_ids: list[int]) -> tuple[
     normalized_ids = sorted({int(table_id) for table_id in table_ids if int(table_id) > 0})
     if not normalized_ids:
         return (0, 0)
+    for table_id in normalized_ids:
+        _invalidate_table_config(table_id)
 
     detached_history_count = (
         db.query(HandHistory)
@@ -1407,7 +1496,7 @@ TOURNAMENT_RESCHEDULE_DELAY_MINUTES = 5
 
 
 def _generate_verification_code() -> str:
-    return f"{random.randint(0, 999999):06d}"
+    return f"{secrets.randbelow(1_000_000):06d}"
 
 
 def _create_email_verification(
@@ -1419,7 +1508,8 @@ def _create_email_verification(
     purpose: str,
     user_id: int | None = None,
     verification_metadata: dict | None = None,
-) -> EmailVerification:
+) -> str:
+    """Replace any pending verification for this email and purpose; returns the new code."""
     verification_code = _generate_verification_code()
     expires_at = datetime.now() + timedelta(minutes=settings.EMAIL_VERIFICATION_EXPIRE_MINUTES)
 
@@ -1432,20 +1522,21 @@ def _create_email_verification(
         pending_query = pending_query.filter(EmailVerification.user_id == user_id)
     pending_query.delete(synchronize_session=False)
 
-    verification = EmailVerification(
-        email=email,
-        username=username,
-        hashed_password=hashed_password,
-        purpose=purpose,
-        user_id=user_id,
-        verification_metadata=verification_metadata,
-        verification_code=verification_code,
-        expires_at=expires_at,
+    db.execute(
+        pg_insert(EmailVerification).values(
+            email=email,
+            username=username,
+            hashed_password=hashed_password,
+            purpose=purpose,
+            user_id=user_id,
+            verification_metadata=verification_metadata,
+            verification_code=verification_code,
+            expires_at=expires_at,
+            verified=False,
+        )
     )
-    db.add(verification)
     db.commit()
-    db.refresh(verification)
-    return verification
+    return verification_code
 
 
 def _can_set_tournament_payout(db: Session, community: Community, user_id: int) -> bool:
@@ -1715,7 +1806,7 @@ def _maybe_start_tournament_table(db: Session, table: Table) -> None:
                     wallet.balance += refund_amount
 
         table.tournament_state = "canceled"
-        table.tournament_completed_at = datetime.utcnow()
+        table.tournament_completed_at = func.now()
         table.tournament_confirmation_deadline = None
         table.tournament_prize_pool = 0
         table.tournament_bracket = {
@@ -1760,7 +1851,7 @@ def _maybe_start_tournament_table(db: Session, table: Table) -> None:
         entry.seed = idx
 
     table.tournament_state = "running"
-    table.tournament_started_at = datetime.utcnow()
+    table.tournament_started_at = func.now()
     table.tournament_confirmation_deadline = None
     table.tournament_bracket = _generate_balanced_tournament_bracket(seeded, table.max_seats)
     if isinstance(table.tournament_bracket, dict):
@@ -1773,32 +1864,6 @@ def _maybe_start_tournament_table(db: Session, table: Table) -> None:
     db.refresh(table)
 
 
-def _table_to_response_with_tournament_meta(db: Session, table: Table, user_id: int | None) -> TableResponse:
-    payload = TableResponse.model_validate(table).model_dump()
-
-    if table.game_type == GameType.TOURNAMENT:
-        registration_count = db.query(TournamentRegistration).filter(
-            TournamentRegistration.table_id == table.id,
-            TournamentRegistration.status.in_([
-                TournamentRegistrationStatus.REGISTERED.value,
-                TournamentRegistrationStatus.CONFIRMED.value,
-            ]),
-        ).count()
-        payload["tournament_registration_count"] = registration_count
-
-        if user_id is not None:
-            payload["tournament_is_registered"] = db.query(TournamentRegistration.id).filter(
-                TournamentRegistration.table_id == table.id,
-                TournamentRegistration.user_id == user_id,
-                TournamentRegistration.status.in_([
-                    TournamentRegistrationStatus.REGISTERED.value,
-                    TournamentRegistrationStatus.CONFIRMED.value,
-                ]),
-            ).first() is not None
-
-    return TableResponse(**payload)
-
-
 def _table_responses_with_metadata(db: Session, tables: list[Table], user_id: int | None) -> list[TableResponse]:
     if not tables:
         return []
@@ -1839,9 +1904,49 @@ def _table_responses_with_metadata(db: Session, tables: list[Table], user_id: in
         ):
             my_queue_rows[int(entry.table_id)] = entry
 
+    # Tournament registration metadata for every listed tournament at once,
+    # rather than two queries per table
+    tournament_ids = [table.id for table in tables if table.game_type == GameType.TOURNAMENT]
+    active_registration_statuses = [
+        TournamentRegistrationStatus.REGISTERED.value,
+        TournamentRegistrationStatus.CONFIRMED.value,
+    ]
+    registration_counts: dict[int, int] = {}
+    my_registered_table_ids: set[int] = set()
+    if tournament_ids:
+        registration_counts = {
+            int(table_id): int(count)
+            for table_id, count in (
+                db.query(TournamentRegistration.table_id, func.count(TournamentRegistration.id))
+                .filter(
+                    TournamentRegistration.table_id.in_(tournament_ids),
+                    TournamentRegistration.status.in_(active_registration_statuses),
+                )
+                .group_by(TournamentRegistration.table_id)
+                .all()
+            )
+        }
+        if user_id is not None:
+            my_registered_table_ids = {
+                int(table_id)
+                for (table_id,) in (
+                    db.query(TournamentRegistration.table_id)
+                    .filter(
+                        TournamentRegistration.table_id.in_(tournament_ids),
+                        TournamentRegistration.user_id == user_id,
+                        TournamentRegistration.status.in_(active_registration_statuses),
+                    )
+                    .all()
+                )
+            }
+
     responses: list[TableResponse] = []
     for table in tables:
-        response = _table_to_response_with_tournament_meta(db, table, user_id)
+        response = TableResponse.model_validate(table)
+        if table.game_type == GameType.TOURNAMENT:
+            response.tournament_registration_count = registration_counts.get(table.id, 0)
+            if user_id is not None:
+                response.tournament_is_registered = table.id in my_registered_table_ids
         response.occupied_seat_count = occupied_counts.get(table.id, 0)
         response.queue_count = queue_counts.get(table.id, 0)
         my_queue_entry = my_queue_rows.get(table.id)
@@ -1856,6 +1961,35 @@ def _table_responses_with_metadata(db: Session, tables: list[Table], user_id: in
 # Authentication Endpoints (Public)
 # ============================================================================
 
+def _find_registration_conflict(db: Session, username: str, email_match) -> str | None:
+    """
+    Return "username" or "email" for the first taken field, checking both in
+    one query; a username clash wins when both are taken by different users.
+    """
+    taken = (
+        db.query(User.username)
+        .filter(or_(User.username == username, email_match))
+        .order_by((User.username == username).desc())
+        .first()
+    )
+    if taken is None:
+        return None
+    return "username" if taken.username == username else "email"
+
+
+def _raise_registration_conflict(conflict: str | None) -> None:
+    """Raise the 400 for a registration whose username or email is taken"""
+    if conflict == "username":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Email already registered"
+    )
+
+
 @app.post("/auth/register", status_code=status.HTTP_201_CREATED)
 def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     """
@@ -1871,21 +2005,12 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     if settings.INVITE_ONLY_REGISTRATION:
         raise HTTPException(status_code=403, detail="Registration is invite-only for this beta")
 
-    # Check if username already exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already registered"
-        )
-    
-    # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
-    if existing_email:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
+    # Production registration only stages a verification, so check uniqueness
+    # up front; dev mode relies on the insert's ON CONFLICT below instead
+    if settings.is_production:
+        conflict = _find_registration_conflict(db, user_data.username, User.email == user_data.email)
+        if conflict:
+            _raise_registration_conflict(conflict)
     
     hashed_password = get_password_hash(user_data.password)
 
@@ -1898,7 +2023,7 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     
     # Production mode: require email verification
     if settings.is_production:
-        verification = _create_email_verification(
+        verification_code = _create_email_verification(
             db,
             email=user_data.email,
             username=user_data.username,
@@ -1907,7 +2032,7 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
         
         # Send verification email
-        _send_verification_email(user_data.email, user_data.username, verification.verification_code)
+        _send_verification_email(user_data.email, user_data.username, verification_code)
         
         return {
             "message": "Verification code sent to your email",
@@ -1915,20 +2040,31 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             "email": user_data.email
         }
     
-    # Dev mode: create user immediately
-    new_user = User(
-        username=user_data.username,
-        email=user_data.email,
-        hashed_password=hashed_password,
-        email_verified=True,  # Auto-verified in dev mode
-        is_admin=is_admin
-    )
+    # Dev mode: create user immediately; a taken username or email makes the
+    # insert a no-op instead of a failed transaction
+    new_user = db.scalars(
+        pg_insert(User)
+        .values(
+            username=user_data.username,
+            email=user_data.email,
+            hashed_password=hashed_password,
+            email_verified=True,  # Auto-verified in dev mode
+            is_admin=is_admin
+        )
+        .on_conflict_do_nothing()
+        .returning(User)
+    ).first()
+    if new_user is None:
+        db.rollback()
+        _raise_registration_conflict(
+            _find_registration_conflict(db, user_data.username, User.email == user_data.email)
+        )
     
-    db.add(new_user)
+    # RETURNING already loaded every column; serialize before commit expires them
+    response = UserResponse.model_validate(new_user)
     db.commit()
-    db.refresh(new_user)
     
-    return UserResponse.model_validate(new_user)
+    return response
 
 
 @app.get("/auth/invite/{token}", response_model=BetaInviteLookupResponse)
@@ -1946,9 +2082,10 @@ def accept_beta_invite(
 ):
     invite = _get_pending_beta_invite_by_token_or_error(db, token)
 
-    if db.query(User).filter(User.username == payload.username).first():
+    conflict = _find_registration_conflict(db, payload.username, func.lower(User.email) == invite.email.lower())
+    if conflict == "username":
         raise HTTPException(status_code=400, detail="Username already registered")
-    if db.query(User).filter(func.lower(User.email) == invite.email.lower()).first():
+    if conflict == "email":
         raise HTTPException(status_code=409, detail="Email already registered")
 
     new_user = User(
@@ -2020,7 +2157,7 @@ def login(username: str, password: str, db: Session = Depends(get_db)):
     
     # Admin users require 2FA in production mode
     if user.is_admin and settings.is_production:
-        verification = _create_email_verification(
+        verification_code = _create_email_verification(
             db,
             email=user.email,
             username=user.username,
@@ -2030,7 +2167,7 @@ def login(username: str, password: str, db: Session = Depends(get_db)):
         )
         
         # Send verification email
-        _send_admin_login_email(user.email, user.username, verification.verification_code)
+        _send_admin_login_email(user.email, user.username, verification_code)
         
         return {
             "requires_2fa": True,
@@ -2111,7 +2248,7 @@ def request_account_recovery(
     """
     user = db.query(User).filter(User.email == payload.email).first()
     if user and user.is_active:
-        verification = _create_email_verification(
+        verification_code = _create_email_verification(
             db,
             email=user.email,
             username=user.username,
@@ -2119,7 +2256,7 @@ def request_account_recovery(
             purpose=EMAIL_VERIFICATION_PURPOSE_ACCOUNT_RECOVERY,
             user_id=user.id,
         )
-        _send_account_recovery_email(user.email, user.username, verification.verification_code)
+        _send_account_recovery_email(user.email, user.username, verification_code)
 
     return {"message": "If an account exists for that email, a verification code has been sent."}
 
@@ -2466,8 +2603,13 @@ async def create_test_fixture_gameplay_stack(
         db.add(table)
         db.flush()
 
-        for seat_number in range(1, payload.max_seats + 1):
-            db.add(TableSeat(table_id=table.id, seat_number=seat_number, user_id=None))
+        db.execute(
+            TableSeat.__table__.insert(),
+            [
+                {"table_id": table.id, "seat_number": seat_number, "user_id": None}
+                for seat_number in range(1, payload.max_seats + 1)
+            ],
+        )
 
         db.commit()
         game_id = f"table_{table.id}"
@@ -2492,6 +2634,8 @@ async def create_test_fixture_gameplay_stack(
 
         response_users: list[dict[str, object]] = []
         for index, (user, password) in enumerate(created_users, start=1):
+            seat_number: int | None = None
+            queue_position: int | None = None
             if payload.auto_seat_players and index <= payload.player_count:
                 await _seat_fixture_user(
                     db=db,
@@ -2501,17 +2645,7 @@ async def create_test_fixture_gameplay_stack(
                     wallet=wallet_rows[user.id],
                     buy_in_amount=payload.buy_in,
                 )
-                response_users.append(
-                    {
-                        "user_id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "password": password,
-                        "is_test_user": True,
-                        "seat_number": index,
-                        "queue_position": None,
-                    }
-                )
+                seat_number = index
             elif payload.auto_seat_players:
                 queue_position = index - payload.player_count
                 queued_wallet = wallet_rows[user.id]
@@ -2525,29 +2659,18 @@ async def create_test_fixture_gameplay_stack(
                     )
                 )
                 db.commit()
-                response_users.append(
-                    {
-                        "user_id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "password": password,
-                        "is_test_user": True,
-                        "seat_number": None,
-                        "queue_position": queue_position,
-                    }
-                )
-            else:
-                response_users.append(
-                    {
-                        "user_id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "password": password,
-                        "is_test_user": True,
-                        "seat_number": None,
-                        "queue_position": None,
-                    }
-                )
+            response_users.append(
+                {
+                    "user_id": user.id,
+                    "username": user.username,
+                    "email": user.email,
+                    "password": password,
+                    "is_test_user": True,
+                    "seat_number": seat_number,
+                    "queue_position": queue_position,
+                    "access_token": _issue_access_token_for_user(user),
+                }
+            )
 
         _update_fixture_run_status(
             db,
@@ -2695,21 +2818,36 @@ def create_league(
     db.add(new_league)
     db.flush()
     db.add(LeagueMember(league_id=new_league.id, user_id=user_id))
+    # The flush's INSERT ... RETURNING loaded created_at; serialize before commit expires it
+    response = LeagueResponse.model_validate(new_league)
     db.commit()
-    db.refresh(new_league)
     
-    return new_league
+    return response
 
 
 @app.get("/api/leagues", response_model=list[LeagueResponse])
 def list_leagues(
+    limit: int | None = Query(default=None, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """List all leagues with membership status for the current user"""
+    """
+    List all leagues with membership status for the current user
+    
+    - **limit**/**offset**: Optional page of leagues, ordered by ID
+    """
     user_id = current_user.get("user_id")
     partition = _get_partition_context_for_user_id(db, user_id)
-    leagues = _apply_partition_filter(db.query(League), League, partition).all()
+    query = db.query(
+        League.id,
+        League.name,
+        League.description,
+        League.currency,
+        League.owner_id,
+        League.created_at,
+    )
+    leagues = _paginate(_apply_partition_filter(query, League, partition), League.id, limit, offset).all()
 
     if not leagues:
         return []
@@ -2756,7 +2894,7 @@ def list_leagues(
     return result
 
 
-@app.delete("/api/leagues/{league_id}", status_code=status.HTTP_204_NO_CONTENT)
+@app.delete("/api/leagues/{league_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
 def delete_league(
     league_id: int,
     current_user: dict = Depends(get_current_user),
@@ -2796,7 +2934,7 @@ def delete_league(
         detached_history_count,
         detached_session_count,
     )
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @app.get("/api/leagues/{league_id}/admins")
@@ -3085,10 +3223,11 @@ def create_community(
     )
     
     db.add(new_community)
+    db.flush()
+    response = CommunityResponse.model_validate(new_community)
     db.commit()
-    db.refresh(new_community)
     
-    return new_community
+    return response
 
 
 @app.post("/api/communities/{community_id}/join", response_model=WalletResponse)
@@ -3107,8 +3246,14 @@ def join_community(
     _ensure_not_banned(user)
     partition = _build_partition_context_for_user(user)
     
-    # Verify community exists
-    community = _get_visible_community_or_404(db, community_id, partition)
+    # Verify community exists, fetching the user's wallet in the same query
+    community, existing_wallet = db.query(Community, Wallet).outerjoin(
+        Wallet,
+        and_(Wallet.community_id == Community.id, Wallet.user_id == user_id)
+    ).filter(Community.id == community_id).first() or (None, None)
+    if not community:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Community not found")
+    _ensure_partition_access(partition, is_test_only=community.is_test_only, test_run_tag=community.test_run_tag)
 
     _assert_user_matches_resource_partition(
         user,
@@ -3122,12 +3267,6 @@ def join_community(
             detail="You must be a league member to join this community"
         )
     
-    # Check if wallet already exists
-    existing_wallet = db.query(Wallet).filter(
-        Wallet.user_id == user_id,
-        Wallet.community_id == community_id
-    ).first()
-    
     if existing_wallet:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -3142,15 +3281,18 @@ def join_community(
     )
     
     db.add(new_wallet)
+    db.flush()
+    response = WalletResponse.model_validate(new_wallet)
     db.commit()
-    db.refresh(new_wallet)
     
-    return new_wallet
+    return response
 
 
 @app.get("/api/communities", response_model=list[CommunityResponse])
 def list_communities(
     league_id: int | None = None,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
     db: Session = Depends(get_db),
 ):
@@ -3158,6 +3300,7 @@ def list_communities(
     List all communities (optionally filter by league)
     
     - **league_id**: Optional league ID to filter by
+    - **limit**/**offset**: Optional page of communities, ordered by ID
     """
     partition = _normal_partition()
     if credentials:
@@ -3165,7 +3308,20 @@ def list_communities(
         if payload and payload.get("user_id"):
             partition = _get_partition_context_for_user_id(db, int(payload["user_id"]))
 
-    query = _apply_partition_filter(db.query(Community), Community, partition)
+    query = _apply_partition_filter(
+        db.query(
+            Community.id,
+            Community.name,
+            Community.description,
+            Community.currency,
+            Community.starting_balance,
+            Community.league_id,
+            Community.commissioner_id,
+            Community.created_at,
+        ),
+        Community,
+        partition,
+    )
     
     if league_id:
         if partition.kind == "normal":
@@ -3183,11 +3339,10 @@ def list_communities(
             return []
         query = query.filter(Community.league_id == league_id)
     
-    communities = query.all()
-    return communities
+    return _paginate(query, Community.id, limit, offset).all()
 
 
-@app.delete("/api/communities/{community_id}", status_code=status.HTTP_204_NO_CONTENT)
+@app.delete("/api/communities/{community_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
 def delete_community(
     community_id: int,
     current_user: dict = Depends(get_current_user),
@@ -3222,7 +3377,7 @@ def delete_community(
         detached_history_count,
         detached_session_count,
     )
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @app.get("/api/communities/{community_id}/admins")
@@ -3349,17 +3504,28 @@ def invite_community_admin(
 
 @app.get("/api/wallets", response_model=list[WalletResponse])
 def get_my_wallets(
+    limit: int | None = Query(default=None, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get all wallets for the authenticated user
+    
+    - **limit**/**offset**: Optional page of wallets, ordered by ID
     """
     user_id = current_user.get("user_id")
 
-    # Get all wallets for this user
-    wallets = db.query(Wallet).filter(Wallet.user_id == user_id).all()
-    return wallets
+    # Get all wallets for this user, reading only the response columns
+    query = db.query(
+        Wallet.id,
+        Wallet.user_id,
+        Wallet.community_id,
+        Wallet.balance,
+        Wallet.created_at,
+        Wallet.updated_at,
+    ).filter(Wallet.user_id == user_id)
+    return _paginate(query, Wallet.id, limit, offset).all()
 
 
 @app.get("/api/communities/{community_id}/wallets", response_model=list[CommunityWalletSummaryResponse])
@@ -3696,18 +3862,17 @@ def create_table(
     )
     
     db.add(db_table)
-    db.commit()
-    db.refresh(db_table)
+    db.flush()
     
-    # Pre-create seats for the table (1 to max_seats)
-    from .models import TableSeat
-    for seat_num in range(1, table.max_seats + 1):
-        seat = TableSeat(
-            table_id=db_table.id,
-            seat_number=seat_num,
-            user_id=None  # Available
-        )
-        db.add(seat)
+    # Pre-create seats for the table (1 to max_seats) in one executemany
+    # INSERT, committed together with the table
+    db.execute(
+        TableSeat.__table__.insert(),
+        [
+            {"table_id": db_table.id, "seat_number": seat_num, "user_id": None}
+            for seat_num in range(1, table.max_seats + 1)
+        ],
+    )
     
     db.commit()
     
@@ -3963,7 +4128,7 @@ def confirm_tournament_entry(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="You are not registered for this tournament")
 
     registration.status = TournamentRegistrationStatus.CONFIRMED.value
-    registration.confirmed_at = datetime.utcnow()
+    registration.confirmed_at = func.now()
     db.commit()
 
     pending_count = db.query(TournamentRegistration).filter(
@@ -4074,7 +4239,7 @@ def update_tournament_payout(
     }
 
 
-@app.delete("/api/tables/{table_id}", status_code=status.HTTP_204_NO_CONTENT)
+@app.delete("/api/tables/{table_id}", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
 def delete_table(
     table_id: int,
     current_user: dict = Depends(get_current_user),
@@ -4124,7 +4289,7 @@ def delete_table(
         f"detached {detached_history_count} hand_history rows"
     )
     
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @app.get("/api/tables/me/active-seat")
@@ -4228,30 +4393,30 @@ def join_table_queue(
             detail="Queue is not enabled for this table"
         )
 
-    existing_queue_entry = (
+    # The table row lock above serializes queue joins, so plain EXISTS probes
+    # are enough here; no need to load or lock the rows themselves
+    already_queued = db.query(
         db.query(TableQueue)
         .filter(
             TableQueue.table_id == table_id,
             TableQueue.user_id == user_id,
         )
-        .with_for_update()
-        .first()
-    )
-    if existing_queue_entry:
+        .exists()
+    ).scalar()
+    if already_queued:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="You are already in the queue for this table"
         )
 
-    seated = (
+    seated = db.query(
         db.query(TableSeat)
         .filter(
             TableSeat.table_id == table_id,
             TableSeat.user_id == user_id,
         )
-        .with_for_update()
-        .first()
-    )
+        .exists()
+    ).scalar()
     if seated:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -4265,11 +4430,15 @@ def join_table_queue(
             detail="Table is no longer full; join a seat instead."
         )
 
-    current_queue_size = int(
-        db.query(func.count(TableQueue.id))
+    # Size and tail position in one query; the table lock above keeps
+    # concurrent joiners from reading the same tail
+    current_queue_size, last_position = (
+        db.query(
+            func.count(TableQueue.id),
+            func.coalesce(func.max(TableQueue.position), 0),
+        )
         .filter(TableQueue.table_id == table_id)
-        .scalar()
-        or 0
+        .one()
     )
     if current_queue_size >= locked_table.max_queue_size:
         raise HTTPException(
@@ -4295,31 +4464,34 @@ def join_table_queue(
     queue_entry = TableQueue(
         table_id=table_id,
         user_id=user_id,
-        position=current_queue_size + 1,
+        position=last_position + 1,
         reserved_buy_in_amount=request.buy_in_amount,
     )
     db.add(queue_entry)
+    # The INSERT's RETURNING fills joined_at, so the response is built before
+    # commit instead of re-selecting the row afterwards
+    db.flush()
+    response = TableQueuePosition(
+        table_id=table_id,
+        user_id=user_id,
+        username=user.username,
+        position=queue_entry.position,
+        joined_at=queue_entry.joined_at,
+    )
     db.commit()
-    db.refresh(queue_entry)
 
     logger.info(
         "User %s joined queue for table %s at position %s with reserved buy-in %s",
         user_id,
         table_id,
-        queue_entry.position,
+        response.position,
         request.buy_in_amount,
     )
 
-    return TableQueuePosition(
-        table_id=table_id,
-        user_id=user_id,
-        username=user.username,
-        position=queue_entry.position,
-        joined_at=queue_entry.joined_at,
-    )
+    return response
 
 
-@app.delete("/api/tables/{table_id}/queue/leave", status_code=status.HTTP_204_NO_CONTENT)
+@app.delete("/api/tables/{table_id}/queue/leave", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
 def leave_table_queue(
     table_id: int,
     current_user: dict = Depends(get_current_user),
@@ -4368,7 +4540,7 @@ def leave_table_queue(
 
     logger.info(f"User {user_id} left queue for table {table_id}")
     
-    return None
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @app.get("/api/tables/{table_id}/queue", response_model=list[TableQueuePosition])
@@ -4386,24 +4558,21 @@ def get_table_queue(
     if table.game_type == GameType.TOURNAMENT:
         return []
     
-    # Get queue entries with user info
-    queue_entries = db.query(TableQueue).filter(
-        TableQueue.table_id == table_id
-    ).order_by(TableQueue.position).all()
-    
-    result = []
-    for entry in queue_entries:
-        user = db.query(User).filter(User.id == entry.user_id).first()
-        result.append(TableQueuePosition(
-            id=entry.id,
-            table_id=table_id,
-            user_id=entry.user_id,
-            username=user.username if user else "Unknown",
-            position=entry.position,
-            joined_at=entry.joined_at
-        ))
-    
-    return result
+    # Select exactly the response columns, with usernames joined in
+    queue_entries = (
+        db.query(
+            TableQueue.table_id,
+            TableQueue.user_id,
+            func.coalesce(User.username, "Unknown").label("username"),
+            TableQueue.position,
+            TableQueue.joined_at,
+        )
+        .outerjoin(User, User.id == TableQueue.user_id)
+        .filter(TableQueue.table_id == table_id)
+        .order_by(TableQueue.position)
+        .all()
+    )
+    return [TableQueuePosition.model_validate(entry) for entry in queue_entries]
 
 
 @app.get("/api/tables/{table_id}/seats", response_model=list[TableSeatResponse])
@@ -4421,34 +4590,25 @@ def get_table_seats(
 
     _maybe_start_tournament_table(db, table)
     
-    # Get all seats with user information
-    from .models import TableSeat
-    seats = db.query(TableSeat).filter(TableSeat.table_id == table_id).order_by(TableSeat.seat_number).all()
-    
-    # Populate username for occupied seats
-    result = []
-    for seat in seats:
-        seat_data = TableSeatResponse(
-            id=seat.id,
-            seat_number=seat.seat_number,
-            user_id=seat.user_id,
-            occupied_at=seat.occupied_at,
-            username=None
-        )
-        
-        # If occupied, get username
-        if seat.user_id:
-            user = db.query(User).filter(User.id == seat.user_id).first()
-            if user:
-                seat_data.username = user.username
-        
-        result.append(seat_data)
-    
-    return result
+    # Get all seats; occupied seats pick up the username from the same query
+    seats = (
+        db.query(
+            TableSeat.id,
+            TableSeat.seat_number,
+            TableSeat.user_id,
+            User.username,
+            TableSeat.occupied_at,
+        )
+        .outerjoin(User, User.id == TableSeat.user_id)
+        .filter(TableSeat.table_id == table_id)
+        .order_by(TableSeat.seat_number)
+        .all()
+    )
+    return [TableSeatResponse.model_validate(seat) for seat in seats]
 
 
 @app.post("/api/tables/{table_id}/join")
-async def join_table(
+def join_table(
     table_id: int,
     request: TableJoinRequest,
     current_user: dict = Depends(get_current_user),
@@ -4518,12 +4678,40 @@ async def join_table(
             detail=f"Seat number must be between 1 and {table.max_seats}"
         )
 
-    # Check if user is already seated at this table
-    existing_seat = db.query(TableSeat).filter(
-        TableSeat.table_id == table_id,
-        TableSeat.user_id == user_id
-    ).first()
+    # Fetch the requested seat, any seat the user already holds here, and the
+    # user's community wallet in one round trip
+    requested_seat_row = aliased(TableSeat)
+    user_seat_row = aliased(TableSeat)
+    join_targets = (
+        db.query(requested_seat_row, user_seat_row, Wallet)
+        .select_from(Table)
+        .outerjoin(
+            requested_seat_row,
+            and_(
+                requested_seat_row.table_id == Table.id,
+                requested_seat_row.seat_number == request.seat_number,
+            ),
+        )
+        .outerjoin(
+            user_seat_row,
+            and_(
+                user_seat_row.table_id == Table.id,
+                user_seat_row.user_id == user_id,
+            ),
+        )
+        .outerjoin(
+            Wallet,
+            and_(
+                Wallet.user_id == user_id,
+                Wallet.community_id == Table.community_id,
+            ),
+        )
+        .filter(Table.id == table_id)
+        .first()
+    )
+    seat, existing_seat, wallet = join_targets if join_targets else (None, None, None)
 
+    # Check if user is already seated at this table
     if existing_seat:
         if existing_seat.seat_number != request.seat_number:
             raise HTTPException(
@@ -4531,11 +4719,6 @@ async def join_table(
                 detail=f"You are already seated at this table in seat {existing_seat.seat_number}. Rejoin that seat or leave first."
             )
 
-        wallet = db.query(Wallet).filter(
-            Wallet.user_id == user_id,
-            Wallet.community_id == table.community_id
-        ).first()
-
         if table.game_type != GameType.TOURNAMENT and not wallet:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -4556,7 +4739,8 @@ async def join_table(
                 test_run_tag=table.test_run_tag,
             )
 
-            response = await post_game_server_json(
+            response = _run_on_event_loop(
+                post_game_server_json,
                 "/_internal/seat-player",
                 seat_request.model_dump(),
                 timeout=10.0
@@ -4612,29 +4796,38 @@ async def join_table(
             "session_id": active_session.id if active_session else None
         }
 
-    seat = db.query(TableSeat).filter(
-        TableSeat.table_id == table_id,
-        TableSeat.seat_number == request.seat_number
-    ).first()
-
     if not seat:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Seat {request.seat_number} not found"
         )
 
+    # Lock the seat and wallet rows until the game server has confirmed the
+    # seating, so concurrent joins for the same seat or wallet serialize here.
+    # populate_existing re-reads the rows loaded above under the lock.
+    seat = (
+        db.query(TableSeat)
+        .filter(TableSeat.id == seat.id)
+        .with_for_update()
+        .populate_existing()
+        .one()
+    )
     if seat.user_id is not None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Seat {request.seat_number} is already occupied"
         )
 
-    # Step 4: Find user's wallet for this community (required for cash game buy-ins)
-    wallet = db.query(Wallet).filter(
-        Wallet.user_id == user_id,
-        Wallet.community_id == table.community_id
-    ).first()
+    if wallet:
+        wallet = (
+            db.query(Wallet)
+            .filter(Wallet.id == wallet.id)
+            .with_for_update()
+            .populate_existing()
+            .one()
+        )
 
+    # Step 4: The user's wallet for this community (required for cash game buy-ins)
     if should_debit_wallet:
         if not wallet:
             raise HTTPException(
@@ -4658,13 +4851,11 @@ async def join_table(
     seat.occupied_at = func.now()
 
     # Close stale active sessions (if any) for this user/table before opening a new one.
-    stale_sessions = db.query(TableSession).filter(
+    db.query(TableSession).filter(
         TableSession.user_id == user_id,
         TableSession.table_id == table_id,
         TableSession.left_at.is_(None)
-    ).all()
-    for stale_session in stale_sessions:
-        stale_session.left_at = func.now()
+    ).update({TableSession.left_at: func.now()}, synchronize_session=False)
 
     new_session = TableSession(
         user_id=user_id,
@@ -4676,17 +4867,9 @@ async def join_table(
         test_run_tag=table.test_run_tag,
     )
     db.add(new_session)
-    
-    db.commit()
-    if wallet:
-        db.refresh(wallet)
-    db.refresh(new_session)
-    
-    if should_debit_wallet and wallet:
-        logger.info(f"Debited {join_stack_amount} from user {user_id}'s wallet. New balance: {wallet.balance}")
-    elif table.game_type == GameType.TOURNAMENT:
-        logger.info(f"Tournament seat join for user {user_id} at table {table_id} using starting stack {join_stack_amount}")
-    logger.info(f"User {user_id} occupied seat {request.seat_number} at table {table_id}")
+    # Flush only: the debit, seat and session commit together once the game
+    # server accepts the player, and roll back together if it does not
+    db.flush()
     
     # Step 7: Seat player in game server (internal HTTP call)
     try:
@@ -4702,23 +4885,15 @@ async def join_table(
             test_run_tag=table.test_run_tag,
         )
         
-        response = await post_game_server_json(
+        response = _run_on_event_loop(
+            post_game_server_json,
             "/_internal/seat-player",
             seat_request.model_dump(),
             timeout=10.0
         )
 
         if response.status_code != 200:
-            # Rollback: credit wallet back and free seat
-            if should_debit_wallet and wallet:
-                wallet.balance += join_stack_amount
-            seat.user_id = None
-            seat.occupied_at = None
-            if new_session:
-                persisted_session = db.query(TableSession).filter(TableSession.id == new_session.id).first()
-                if persisted_session:
-                    db.delete(persisted_session)
-            db.commit()
+            db.rollback()
             logger.error(f"Failed to seat player. Rolling back wallet debit and seat occupation. Response: {response.text}")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -4726,22 +4901,21 @@ async def join_table(
             )
     
     except httpx.RequestError as e:
-        # Rollback: credit wallet back and free seat
-        if should_debit_wallet and wallet:
-            wallet.balance += join_stack_amount
-        seat.user_id = None
-        seat.occupied_at = None
-        if new_session:
-            persisted_session = db.query(TableSession).filter(TableSession.id == new_session.id).first()
-            if persisted_session:
-                db.delete(persisted_session)
-        db.commit()
+        db.rollback()
         logger.error(f"Game server request failed. Rolling back wallet debit and seat occupation. Error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Game server unavailable: {str(e)}"
         )
     
+    db.commit()
+    
+    if should_debit_wallet and wallet:
+        logger.info(f"Debited {join_stack_amount} from user {user_id}'s wallet. New balance: {wallet.balance}")
+    elif table.game_type == GameType.TOURNAMENT:
+        logger.info(f"Tournament seat join for user {user_id} at table {table_id} using starting stack {join_stack_amount}")
+    logger.info(f"User {user_id} occupied seat {request.seat_number} at table {table_id}")
+    
     # Step 8: Update table status if needed
     if table.status == TableStatus.WAITING:
         # You could add logic here to check if table is full and change status
@@ -4787,7 +4961,13 @@ def verify_token_internal(
             message="Token missing required fields"
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Signature/expiry checks hit decode_token's verified-token cache; only
+    # the ban and test-partition flags need a (narrow) row read per call
+    user = (
+        db.query(User.is_banned, User.is_test_user, User.test_run_tag)
+        .filter(User.id == user_id)
+        .first()
+    )
     if not user:
         return TokenVerifyResponse(valid=False, message="User not found")
     if user.is_banned:
@@ -4810,34 +4990,42 @@ def debit_wallet(operation: WalletOperation, db: Session = Depends(get_db)):
     This endpoint is called by the game server when a player buys into a game.
     Fails if insufficient funds.
     """
-    # Find wallet
-    wallet = db.query(Wallet).filter(
-        Wallet.user_id == operation.user_id,
-        Wallet.community_id == operation.community_id
-    ).first()
-    
-    if not wallet:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Wallet not found"
-        )
-    
-    # Check sufficient funds
-    if wallet.balance < operation.amount:
+    # Check funds and debit in one conditional UPDATE so concurrent debits
+    # cannot both pass the balance check
+    new_balance = db.execute(
+        update(Wallet)
+        .where(
+            Wallet.user_id == operation.user_id,
+            Wallet.community_id == operation.community_id,
+            Wallet.balance >= operation.amount,
+        )
+        .values(balance=Wallet.balance - operation.amount)
+        .returning(Wallet.balance)
+    ).scalar_one_or_none()
+    
+    if new_balance is None:
+        # No row updated: tell a missing wallet apart from insufficient funds
+        db.rollback()
+        balance = db.query(Wallet.balance).filter(
+            Wallet.user_id == operation.user_id,
+            Wallet.community_id == operation.community_id
+        ).scalar()
+        if balance is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Wallet not found"
+            )
         return WalletOperationResponse(
             success=False,
-            new_balance=wallet.balance,
-            message=f"Insufficient funds. Available: {wallet.balance}, Required: {operation.amount}"
+            new_balance=balance,
+            message=f"Insufficient funds. Available: {balance}, Required: {operation.amount}"
         )
     
-    # Debit the wallet
-    wallet.balance -= operation.amount
     db.commit()
-    db.refresh(wallet)
     
     return WalletOperationResponse(
         success=True,
-        new_balance=wallet.balance,
+        new_balance=new_balance,
         message=f"Debited {operation.amount} from wallet"
     )
 
@@ -4849,26 +5037,29 @@ def credit_wallet(operation: WalletOperation, db: Session = Depends(get_db)):
     
     This endpoint is called by the game server when a player wins chips.
     """
-    # Find wallet
-    wallet = db.query(Wallet).filter(
-        Wallet.user_id == operation.user_id,
-        Wallet.community_id == operation.community_id
-    ).first()
-    
-    if not wallet:
+    # Credit in place; the database does the addition, so concurrent credits
+    # and debits cannot overwrite each other
+    new_balance = db.execute(
+        update(Wallet)
+        .where(
+            Wallet.user_id == operation.user_id,
+            Wallet.community_id == operation.community_id
+        )
+        .values(balance=Wallet.balance + operation.amount)
+        .returning(Wallet.balance)
+    ).scalar_one_or_none()
+    
+    if new_balance is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Wallet not found"
         )
     
-    # Credit the wallet
-    wallet.balance += operation.amount
     db.commit()
-    db.refresh(wallet)
     
     return WalletOperationResponse(
         success=True,
-        new_balance=wallet.balance,
+        new_balance=new_balance,
         message=f"Credited {operation.amount} to wallet"
     )
 
@@ -4901,6 +5092,12 @@ def get_table_config(table_id: int, db: Session = Depends(get_db)):
     
     Returns table details including action_timeout_seconds for game configuration.
     """
+    now = time.monotonic()
+    with _table_config_cache_lock:
+        cached = _table_config_cache.get(table_id)
+    if cached and cached[0] > now:
+        return dict(cached[1])
+
     table = db.query(Table).filter(Table.id == table_id).first()
     
     if not table:
@@ -4909,7 +5106,7 @@ def get_table_config(table_id: int, db: Session = Depends(get_db)):
             detail="Table not found"
         )
     
-    return {
+    payload = {
         "id": table.id,
         "name": table.name,
         "community_id": table.community_id,
@@ -4923,6 +5120,11 @@ def get_table_config(table_id: int, db: Session = Depends(get_db)):
         "action_timeout_seconds": table.action_timeout_seconds,
         "max_queue_size": table.max_queue_size
     }
+    ttl = settings.TABLE_CONFIG_CACHE_TTL_SECONDS
+    if ttl > 0:
+        with _table_config_cache_lock:
+            _table_config_cache[table_id] = (now + ttl, payload)
+    return dict(payload)
 
 
 @app.get("/api/internal/tables/{table_id}/active-sessions")
@@ -4966,35 +5168,45 @@ def check_table_cleanup(table_id: int, db: Session = Depends(get_db)):
     This endpoint is called by the game server when all players leave a table.
     It checks if the table is permanent. If not, it deletes the table and all related data.
     """
-    # Get table
-    table = db.query(Table).filter(Table.id == table_id).first()
-    
-    if not table:
-        return {"deleted": False, "message": "Table not found"}
-    
-    # Check if table is permanent
-    if table.is_permanent:
-        return {"deleted": False, "message": "Table is permanent"}
-    
-    # Check if table has any seated players
-    from .models import TableSeat
-    seated_count = db.query(TableSeat).filter(
-        TableSeat.table_id == table_id,
-        TableSeat.user_id.isnot(None)
-    ).count()
-    
-    if seated_count > 0:
-        return {"deleted": False, "message": f"Table has {seated_count} seated players"}
-    
-    # Preserve historical hands for analysis after table deletion.
+    # Preserve historical hands for analysis after table deletion; rolled back
+    # below if the table turns out to be permanent or occupied.
     detached_history_count = _detach_hand_history_from_table(db, table_id)
 
-    # Table is non-permanent and empty, delete it
-    db.delete(table)
+    # Delete only a non-permanent table with no seated players, checked and
+    # applied atomically. Seats, queue rows and registrations go with it via
+    # ON DELETE CASCADE.
+    deleted = db.execute(
+        Table.__table__.delete()
+        .where(
+            Table.id == table_id,
+            Table.is_permanent.is_(False),
+            ~(
+                select(TableSeat.id)
+                .where(
+                    TableSeat.table_id == table_id,
+                    TableSeat.user_id.isnot(None),
+                )
+                .exists()
+            ),
+        )
+        .returning(Table.name)
+    ).first()
+
+    if not deleted:
+        db.rollback()
+        # Rare path: work out which condition kept the table
+        table = db.query(Table.is_permanent).filter(Table.id == table_id).first()
+        if not table:
+            return {"deleted": False, "message": "Table not found"}
+        if table.is_permanent:
+            return {"deleted": False, "message": "Table is permanent"}
+        seated_count = _occupied_seat_count(db, table_id)
+        return {"deleted": False, "message": f"Table has {seated_count} seated players"}
+
     db.commit()
     
     logger.info(
-        f"Deleted non-permanent table {table_id} ({table.name}); "
+        f"Deleted non-permanent table {table_id} ({deleted.name}); "
         f"detached {detached_history_count} hand_history rows"
     )
     
@@ -5002,7 +5214,7 @@ def check_table_cleanup(table_id: int, db: Session = Depends(get_db)):
 
 
 @app.post("/api/internal/tables/{table_id}/unseat/{user_id}")
-async def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_db)):
+def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_db)):
     """
     Internal endpoint: Unseat a player from a table
     
@@ -5047,17 +5259,20 @@ async def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_d
     auto_seated_payload: dict[str, object] | None = None
 
     while True:
-        first_in_queue = (
-            db.query(TableQueue)
+        # Queue head and its user in one query; the table row lock taken above
+        # keeps concurrent unseats from promoting the same entry
+        queue_head = (
+            db.query(TableQueue, User)
+            .outerjoin(User, User.id == TableQueue.user_id)
             .filter(TableQueue.table_id == table_id)
             .order_by(TableQueue.position.asc(), TableQueue.joined_at.asc(), TableQueue.id.asc())
             .first()
         )
-        if not first_in_queue:
+        if not queue_head:
             db.commit()
             return {"success": True, "message": f"Player unseated from seat {freed_seat_number}"}
 
-        queued_user = db.query(User).filter(User.id == first_in_queue.user_id).first()
+        first_in_queue, queued_user = queue_head
         if not queued_user or queued_user.is_banned:
             refund_amount = int(first_in_queue.reserved_buy_in_amount or table.buy_in)
             queued_wallet = _lock_wallet_for_update(db, first_in_queue.user_id, table.community_id)
@@ -5086,7 +5301,8 @@ async def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_d
         runtime_applied = False
         runtime_response_text: str | None = None
         try:
-            response = await post_game_server_json(
+            response = _run_on_event_loop(
+                post_game_server_json,
                 "/_internal/seat-player",
                 seat_request.model_dump(),
                 timeout=2.0,
@@ -5111,7 +5327,8 @@ async def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_d
                 exc,
             )
             try:
-                confirm_response = await get_game_server_json(
+                confirm_response = _run_on_event_loop(
+                    get_game_server_json,
                     f"/_internal/promotions/{promotion_id}",
                     timeout=2.0,
                 )
@@ -5160,17 +5377,11 @@ async def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_d
             seat.user_id = queued_user.id
             seat.occupied_at = func.now()
 
-            stale_sessions = (
-                db.query(TableSession)
-                .filter(
-                    TableSession.user_id == queued_user.id,
-                    TableSession.table_id == table_id,
-                    TableSession.left_at.is_(None),
-                )
-                .all()
-            )
-            for stale_session in stale_sessions:
-                stale_session.left_at = func.now()
+            db.query(TableSession).filter(
+                TableSession.user_id == queued_user.id,
+                TableSession.table_id == table_id,
+                TableSession.left_at.is_(None),
+            ).update({TableSession.left_at: func.now()}, synchronize_session=False)
 
             promoted_session = TableSession(
                 user_id=queued_user.id,
@@ -5197,7 +5408,7 @@ async def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_d
                     commit_exc,
                 )
                 try:
-                    await rollback_game_server_promotion(promotion_id, timeout=3.0)
+                    _run_on_event_loop(rollback_game_server_promotion, promotion_id, timeout=3.0)
                 except Exception as rollback_exc:
                     logger.error("Promotion %s rollback failed: %s", promotion_id, rollback_exc)
 
@@ -5274,7 +5485,7 @@ async def unseat_player(table_id: int, user_id: int, db: Session = Depends(get_d
 
 
 @app.post("/api/tables/{table_id}/leave")
-async def leave_table(
+def leave_table(
     table_id: int,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -5289,7 +5500,7 @@ async def leave_table(
     _get_visible_table_or_404(db, table_id, partition)
 
     # Best-effort unseat (also handles queue promotion).
-    result = await unseat_player(table_id, user_id, db)
+    result = unseat_player(table_id, user_id, db)
 
     # Always close stale active sessions for this user/table.
     from sqlalchemy.sql import func
@@ -5343,19 +5554,20 @@ def record_hand_history(
         is_test_only = table.is_test_only if table else bool(history.is_test_only)
         test_run_tag = table.test_run_tag if table else history.test_run_tag
 
-        # Create hand history record
-        hand_record = HandHistory(
-            community_id=history.community_id,
-            table_id=history.table_id,
-            table_name=history.table_name,
-            hand_data=history.hand_data,
-            is_test_only=is_test_only,
-            test_run_tag=test_run_tag,
-        )
-        
-        db.add(hand_record)
-        db.flush()
-        recorded_at = hand_record.played_at or datetime.utcnow()
+        # Create hand history record, reading back the id and server-side
+        # played_at from the same statement
+        hand_id, recorded_at = db.execute(
+            HandHistory.__table__.insert()
+            .values(
+                community_id=history.community_id,
+                table_id=history.table_id,
+                table_name=history.table_name,
+                hand_data=history.hand_data,
+                is_test_only=is_test_only,
+                test_run_tag=test_run_tag,
+            )
+            .returning(HandHistory.id, HandHistory.played_at)
+        ).one()
 
         # Link this hand to each participant's active table session.
         player_rows = history.hand_data.get("players", []) if isinstance(history.hand_data, dict) else []
@@ -5366,6 +5578,11 @@ def record_hand_history(
             except (TypeError, ValueError):
                 continue
 
+        db.add_all([
+            HandParticipant(user_id=participant_user_id, hand_id=hand_id, played_at=recorded_at)
+            for participant_user_id in participant_user_ids
+        ])
+
         linked_sessions = 0
         for participant_user_id in participant_user_ids:
             # Prefer a session that spans the hand timestamp.
@@ -5395,22 +5612,16 @@ def record_hand_history(
             if session.is_test_only != is_test_only or session.test_run_tag != test_run_tag:
                 continue
 
-            exists = db.query(SessionHand).filter(
-                SessionHand.session_id == session.id,
-                SessionHand.hand_id == hand_record.id
-            ).first()
-            if exists:
-                continue
-
-            db.add(SessionHand(session_id=session.id, hand_id=hand_record.id))
+            # The hand row was inserted above in this transaction, so no
+            # session can already be linked to it
+            db.add(SessionHand(session_id=session.id, hand_id=hand_id))
             linked_sessions += 1
 
         db.commit()
-        db.refresh(hand_record)
         
         return {
             "success": True,
-            "hand_id": str(hand_record.id),
+            "hand_id": str(hand_id),
             "linked_sessions": linked_sessions,
             "message": "Hand history recorded"
         }
@@ -5423,109 +5634,151 @@ def record_hand_history(
         )
 
 
+HAND_HISTORY_CURSOR_HEADER = "X-Next-Cursor"
+HAND_HISTORY_MAX_PAGE_SIZE = 500
+HAND_HISTORY_FETCH_BATCH_SIZE = 100
+
+
+def _encode_hand_history_cursor(played_at: datetime, hand_id) -> str:
+    raw = f"{played_at.isoformat()}|{hand_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_hand_history_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        played_at_text, hand_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(played_at_text), str(uuid.UUID(hand_id))
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid hand history cursor"
+        )
+
+
+def _build_hand_history_page_sql(*, test_partition: bool, keyset: bool):
+    # hand_participants holds one row per seated player, so the page is a
+    # range scan on (user_id, played_at DESC, hand_id DESC)
+    conditions = ["p.user_id = :user_id"]
+    if test_partition:
+        conditions.append("h.is_test_only = TRUE AND h.test_run_tag = :test_run_tag")
+    else:
+        conditions.append("h.is_test_only = FALSE")
+    page_params = [bindparam("user_id", type_=Integer), bindparam("limit", type_=Integer)]
+    if keyset:
+        conditions.append("(p.played_at, p.hand_id) < (:cursor_played_at, CAST(:cursor_id AS uuid))")
+        page_clause = "LIMIT :limit"
+    else:
+        page_clause = "LIMIT :limit OFFSET :offset"
+        page_params.append(bindparam("offset", type_=Integer))
+
+    return text(f"""
+        SELECT
+            h.id::text AS id,
+            h.table_name,
+            p.played_at,
+            COALESCE(h.pot_size, 0) AS pot_size,
+            h.hand_data->'winner'->>'username' AS winner_username,
+            h.player_count
+        FROM hand_participants p
+        JOIN hand_history h ON h.id = p.hand_id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY p.played_at DESC, p.hand_id DESC
+        {page_clause}
+    """).bindparams(*page_params)
+
+
+# Built once at import, keyed by (test partition, keyset cursor)
+_HAND_HISTORY_PAGE_SQL = {
+    (test_partition, keyset): _build_hand_history_page_sql(test_partition=test_partition, keyset=keyset)
+    for test_partition in (False, True)
+    for keyset in (False, True)
+}
+
+_VISIBLE_HAND_SQL = text("""
+    SELECT h.id, h.community_id, h.table_id, h.table_name, h.played_at, h.hand_data
+    FROM hand_history h
+    WHERE h.id = :hand_id
+    AND h.is_test_only = FALSE
+    AND EXISTS (
+        SELECT 1 FROM hand_participants p
+        WHERE p.hand_id = h.id AND p.user_id = :user_id
+    )
+""").bindparams(bindparam("user_id", type_=Integer))
+
+_VISIBLE_TEST_HAND_SQL = text("""
+    SELECT h.id, h.community_id, h.table_id, h.table_name, h.played_at, h.hand_data
+    FROM hand_history h
+    WHERE h.id = :hand_id
+    AND h.is_test_only = TRUE
+    AND h.test_run_tag = :test_run_tag
+    AND EXISTS (
+        SELECT 1 FROM hand_participants p
+        WHERE p.hand_id = h.id AND p.user_id = :user_id
+    )
+""").bindparams(bindparam("user_id", type_=Integer))
+
+
 @app.get("/api/me/hands", response_model=list[HandHistorySummary])
 def get_my_hand_history(
-    limit: int = 20,
-    offset: int = 0,
+    response: Response,
+    limit: int = Query(default=20, ge=1, le=HAND_HISTORY_MAX_PAGE_SIZE),
+    offset: int = Query(default=0, ge=0),
+    cursor: str | None = None,
     current_user: dict = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get hand history for the current user
     
-    Returns a paginated list of hands where the user was a participant.
+    Returns a page of hands where the user was a participant, newest first.
     Only returns summary information - use /api/hands/{hand_id} for full details.
+    
+    When a full page is returned, the X-Next-Cursor header carries an opaque
+    cursor; pass it back as ?cursor= to continue after the last hand without
+    rescanning earlier pages. offset is only honoured without a cursor.
     """
     user_id = current_user["user_id"]
     partition = _get_partition_context_for_user_id(db, user_id)
     
-    # Query hands where user_id appears in the hand_data.players array
-    # PostgreSQL JSONB query: hand_data @> '{"players": [{"user_id": X}]}'
-    # But we need to search more flexibly, so we use jsonb_array_elements
-    
-    if partition.kind == "normal":
-        query = text("""
-        SELECT h.id, h.table_name, h.played_at, h.hand_data
-        FROM hand_history h
-        WHERE h.is_test_only = FALSE
-        AND EXISTS (
-            SELECT 1 FROM jsonb_array_elements(h.hand_data->'players') AS player
-            WHERE (player->>'user_id')::int = :user_id
-        )
-        ORDER BY h.played_at DESC
-        LIMIT :limit OFFSET :offset
-    """)
-        params = {"user_id": user_id, "limit": limit, "offset": offset}
+    params = {"user_id": user_id, "limit": limit}
+    if partition.kind != "normal":
+        params["test_run_tag"] = partition.run_tag
+    if cursor:
+        params["cursor_played_at"], params["cursor_id"] = _decode_hand_history_cursor(cursor)
     else:
-        query = text("""
-        SELECT h.id, h.table_name, h.played_at, h.hand_data
-        FROM hand_history h
-        WHERE h.is_test_only = TRUE
-        AND h.test_run_tag = :test_run_tag
-        AND EXISTS (
-            SELECT 1 FROM jsonb_array_elements(h.hand_data->'players') AS player
-            WHERE (player->>'user_id')::int = :user_id
-        )
-        ORDER BY h.played_at DESC
-        LIMIT :limit OFFSET :offset
-    """)
-        params = {"user_id": user_id, "limit": limit, "offset": offset, "test_run_tag": partition.run_tag}
-
-    results = db.execute(query, params)
-    
-    # Transform results into summary format
+        params["offset"] = offset
+
+    query = _HAND_HISTORY_PAGE_SQL[(partition.kind != "normal", bool(cursor))]
+    # Large pages are fetched through a server-side cursor in fixed batches
+    # instead of being buffered whole by the driver
+    result = db.execute(
+        query.execution_options(yield_per=HAND_HISTORY_FETCH_BATCH_SIZE),
+        params,
+    )
+
+    # The summary fields are projected in SQL, so hand_data never leaves Postgres
     summaries = []
-    for row in results:
-        hand_data = row.hand_data
-        
-        # Extract summary information
-        pot_size = hand_data.get("pot", 0)
-        players = hand_data.get("players", [])
-        winner = hand_data.get("winner", {})
-        
-        summaries.append(HandHistorySummary(
-            id=str(row.id),
-            table_name=row.table_name,
-            played_at=row.played_at,
-            pot_size=pot_size,
-            winner_username=winner.get("username") if winner else None,
-            player_count=len(players)
-        ))
-    
+    last_row = None
+    for last_row in result:
+        summaries.append(HandHistorySummary.model_validate(last_row))
+
+    if len(summaries) == limit:
+        response.headers[HAND_HISTORY_CURSOR_HEADER] = _encode_hand_history_cursor(
+            last_row.played_at, last_row.id
+        )
     return summaries
 
 
 def _get_visible_hand_history_row(db: Session, hand_id: str, user_id: int):
-    from sqlalchemy import text
     partition = _get_partition_context_for_user_id(db, user_id)
 
     if partition.kind == "normal":
-        query = text("""
-            SELECT h.id, h.community_id, h.table_id, h.table_name, h.played_at, h.hand_data
-            FROM hand_history h
-            WHERE h.id = :hand_id
-            AND h.is_test_only = FALSE
-            AND EXISTS (
-                SELECT 1 FROM jsonb_array_elements(h.hand_data->'players') AS player
-                WHERE (player->>'user_id')::int = :user_id
-            )
-        """)
-        params = {"hand_id": hand_id, "user_id": user_id}
-    else:
-        query = text("""
-            SELECT h.id, h.community_id, h.table_id, h.table_name, h.played_at, h.hand_data
-            FROM hand_history h
-            WHERE h.id = :hand_id
-            AND h.is_test_only = TRUE
-            AND h.test_run_tag = :test_run_tag
-            AND EXISTS (
-                SELECT 1 FROM jsonb_array_elements(h.hand_data->'players') AS player
-                WHERE (player->>'user_id')::int = :user_id
-            )
-        """)
-        params = {"hand_id": hand_id, "user_id": user_id, "test_run_tag": partition.run_tag}
-
-    return db.execute(query, params).first()
+        return db.execute(_VISIBLE_HAND_SQL, {"hand_id": hand_id, "user_id": user_id}).first()
+    return db.execute(
+        _VISIBLE_TEST_HAND_SQL,
+        {"hand_id": hand_id, "user_id": user_id, "test_run_tag": partition.run_tag},
+    ).first()
 
 
 @app.get("/api/hands/{hand_id}", response_model=HandHistoryResponse)
@@ -5668,9 +5921,7 @@ def _unsupported_learning_response(
 
 
 def _error_response(status_code: int, error_code: str, message: str):
-    from fastapi.responses import JSONResponse
-
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status_code,
         content={
             "error": error_code,
@@ -8166,7 +8417,7 @@ def request_profile_update(
             detail="No changes detected"
         )
 
-    verification = _create_email_verification(
+    verification_code = _create_email_verification(
         db,
         email=user.email,
         username=user.username,
@@ -8178,12 +8429,12 @@ def request_profile_update(
     
     # Send verification email (in dev mode, just log it)
     if settings.is_production:
-        send_profile_update_email(user.email, user.username, verification.verification_code)
+        send_profile_update_email(user.email, user.username, verification_code)
     else:
         logger.info(
             "[DEV MODE] Profile update verification code for %s: %s",
             user.email,
-            verification.verification_code,
+            verification_code,
         )
     
     return ProfileUpdateInitResponse(
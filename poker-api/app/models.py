@@ -2,14 +2,18 @@
 Database models for the Poker Platform
 """
 from sqlalchemy import (
+    BigInteger,
     Column,
+    Computed,
     Integer,
     String,
     ForeignKey,
     DateTime,
     Numeric,
+    SmallInteger,
     Boolean,
     Enum,
+    Index,
     UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
@@ -255,8 +259,11 @@ class TableSeat(Base):
     table = relationship("Table", back_populates="seats")
     user = relationship("User")
     
-    # Unique constraint: one seat number per table, one user per table
+    # Seats are looked up by (table, seat number) when joining and by
+    # (table, user) when checking, unseating and listing a user's seat
     __table_args__ = (
+        Index("ix_table_seats_table_seat_number", "table_id", "seat_number"),
+        Index("ix_table_seats_table_user", "table_id", "user_id"),
         {"schema": None},
     )
 
@@ -297,11 +304,33 @@ class HandHistory(Base):
     # JSONB stores the entire hand data: players, actions, cards, winner, pot, etc.
     # This is indexed and queryable in PostgreSQL
     hand_data = Column(JSONB, nullable=False)
+    # Pot extracted from hand_data by Postgres so it can be sorted and filtered
+    # through a btree index
+    pot_size = Column(
+        BigInteger,
+        Computed(
+            "CASE WHEN jsonb_typeof(hand_data->'pot') = 'number' "
+            "THEN (hand_data->>'pot')::numeric::bigint END",
+            persisted=True,
+        ),
+    )
+    player_count = Column(
+        SmallInteger,
+        Computed(
+            "CASE WHEN jsonb_typeof(hand_data->'players') = 'array' "
+            "THEN jsonb_array_length(hand_data->'players') ELSE 0 END",
+            persisted=True,
+        ),
+    )
     
     # Relationships
     community = relationship("Community")
     table = relationship("Table")
 
+    __table_args__ = (
+        Index("idx_hand_history_pot", "pot_size"),
+    )
+
 
 class TableSession(Base):
     """A user's table session from join to leave."""
@@ -342,6 +371,20 @@ class SessionHand(Base):
     )
 
 
+class HandParticipant(Base):
+    """One row per player seated in a recorded hand, for per-user history lookups."""
+    __tablename__ = "hand_participants"
+
+    user_id = Column(Integer, primary_key=True)
+    hand_id = Column(UUID(as_uuid=True), ForeignKey("hand_history.id", ondelete="CASCADE"), primary_key=True)
+    played_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_hand_participants_user_played_at", "user_id", played_at.desc(), hand_id.desc()),
+        Index("ix_hand_participants_hand_id", "hand_id"),
+    )
+
+
 class TournamentRegistrationStatus(str, enum.Enum):
     REGISTERED = "registered"
     CONFIRMED = "confirmed"
@@ -220,3 +220,7 @@ def ensure_schema() -> None:
             cursor.close()
         if connection:
             connection.close()
+
+
+if __name__ == "__main__":
+    ensure_schema()
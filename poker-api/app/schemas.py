@@ -675,6 +675,7 @@ class TestFixtureUserCredential(BaseModel):
     is_test_user: bool = True
     seat_number: Optional[int] = None
     queue_position: Optional[int] = None
+    access_token: Optional[str] = None  # Saves E2E runners a login per user
 
 
 class TestFixtureGameplayStackResponse(BaseModel):
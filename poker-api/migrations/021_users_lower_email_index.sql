@@ -0,0 +1,5 @@
+-- users.username and users.email already have unique B-tree indexes from the
+-- model (ix_users_username, ix_users_email). Beta-invite creation and
+-- acceptance look users up by LOWER(email), which those indexes cannot serve.
+CREATE INDEX IF NOT EXISTS ix_users_email_lower
+    ON users (LOWER(email));
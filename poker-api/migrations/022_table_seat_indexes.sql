@@ -0,0 +1,10 @@
+-- table_seats had only its primary key, so every seat lookup scanned the
+-- table. Seats are found by (table_id, seat_number) when joining and by
+-- (table_id, user_id) when checking, unseating and promoting. table_queue is
+-- already covered by its (table_id, user_id) and (table_id, position) unique
+-- constraints.
+CREATE INDEX IF NOT EXISTS ix_table_seats_table_seat_number
+    ON table_seats (table_id, seat_number);
+
+CREATE INDEX IF NOT EXISTS ix_table_seats_table_user
+    ON table_seats (table_id, user_id);
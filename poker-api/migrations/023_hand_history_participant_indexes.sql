@@ -0,0 +1,4 @@
+-- Hand history lists are sorted newest first by played_at. Migrations run
+-- inside a transaction, so this cannot be built CONCURRENTLY here.
+CREATE INDEX IF NOT EXISTS idx_hand_history_played_at
+    ON hand_history (played_at DESC);
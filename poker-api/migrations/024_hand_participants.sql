@@ -0,0 +1,27 @@
+-- Per-user hand lookups previously unpacked hand_data->'players' on every
+-- request. hand_participants stores one (user_id, hand_id) row per seated
+-- player at record time, so /api/me/hands is a btree range scan.
+CREATE TABLE IF NOT EXISTS hand_participants (
+    user_id INTEGER NOT NULL,
+    hand_id UUID NOT NULL REFERENCES hand_history(id) ON DELETE CASCADE,
+    played_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (user_id, hand_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_hand_participants_user_played_at
+    ON hand_participants (user_id, played_at DESC, hand_id DESC);
+CREATE INDEX IF NOT EXISTS ix_hand_participants_hand_id
+    ON hand_participants (hand_id);
+
+INSERT INTO hand_participants (user_id, hand_id, played_at)
+SELECT DISTINCT (player->>'user_id')::int, h.id, h.played_at
+FROM hand_history h
+CROSS JOIN LATERAL jsonb_array_elements(
+    CASE WHEN jsonb_typeof(h.hand_data->'players') = 'array'
+         THEN h.hand_data->'players'
+         ELSE '[]'::jsonb
+    END
+) AS player
+WHERE (player->>'user_id') ~ '^[0-9]+$'
+  AND h.played_at IS NOT NULL
+ON CONFLICT DO NOTHING;
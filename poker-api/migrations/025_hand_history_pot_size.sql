@@ -0,0 +1,14 @@
+-- GIN on hand_data serves containment only, so sorting or range-filtering
+-- by pot would parse every row's JSON. pot_size is generated from
+-- hand_data->'pot' and indexed with a btree. Non-numeric pots are stored as
+-- NULL rather than failing the insert.
+ALTER TABLE hand_history
+    ADD COLUMN IF NOT EXISTS pot_size BIGINT
+    GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(hand_data->'pot') = 'number'
+             THEN (hand_data->>'pot')::numeric::bigint
+        END
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_hand_history_pot
+    ON hand_history (pot_size);
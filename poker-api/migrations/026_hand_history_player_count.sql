@@ -0,0 +1,12 @@
+-- Hand history summaries counted hand_data->'players' on every read.
+-- player_count is generated from the same array when the row is written, so
+-- listings read a column instead of walking the JSON. A missing or non-array
+-- players value counts as 0, as the summary query did before.
+ALTER TABLE hand_history
+    ADD COLUMN IF NOT EXISTS player_count SMALLINT
+    GENERATED ALWAYS AS (
+        CASE WHEN jsonb_typeof(hand_data->'players') = 'array'
+             THEN jsonb_array_length(hand_data->'players')
+             ELSE 0
+        END
+    ) STORED;
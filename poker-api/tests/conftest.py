@@ -98,6 +98,8 @@ def reset_database(app_modules: dict[str, Any]) -> None:
     database = app_modules["database"]
     database.Base.metadata.drop_all(bind=database.engine)
     database.Base.metadata.create_all(bind=database.engine)
+    # Table ids restart with the schema, so cached configs must not survive it
+    app_modules["main"]._invalidate_table_config()
     yield
 
 
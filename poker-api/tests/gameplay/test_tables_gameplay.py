@@ -376,6 +376,55 @@ def setup_queue_promotion_fixture(
     )
 
 
+def test_join_community_creates_wallet_once(client, db_session, auth_state, app_modules):
+    setup = seed_league_graph(db_session, app_modules)
+    set_current_user(auth_state, setup.member)
+
+    joined = client.post(f"/api/communities/{setup.community.id}/join")
+    assert joined.status_code == 200, joined.text
+    assert joined.json()["community_id"] == setup.community.id
+    assert Decimal(str(joined.json()["balance"])) == Decimal("1000.00")
+
+    rejoined = client.post(f"/api/communities/{setup.community.id}/join")
+    assert rejoined.status_code == 400
+    assert rejoined.json()["detail"] == "Already a member of this community"
+
+    missing = client.post(f"/api/communities/{setup.community.id + 1000}/join")
+    assert missing.status_code == 404
+
+    set_current_user(auth_state, setup.outsider)
+    outsider = client.post(f"/api/communities/{setup.community.id}/join")
+    assert outsider.status_code == 403
+
+
+def test_list_communities_and_wallets_paginate_by_id(client, db_session, auth_state, app_modules):
+    models_module = app_modules["models"]
+    setup = seed_league_graph(db_session, app_modules)
+    second = models_module.Community(
+        name="Beta Community",
+        league_id=setup.league.id,
+        starting_balance=Decimal("500.00"),
+        commissioner_id=setup.owner.id,
+    )
+    db_session.add(second)
+    db_session.commit()
+    create_wallet(db_session, models_module, setup.member, setup.community, 100)
+    create_wallet(db_session, models_module, setup.member, second, 200)
+    set_current_user(auth_state, setup.member)
+
+    everything = client.get("/api/communities", params={"league_id": setup.league.id})
+    assert [item["name"] for item in everything.json()] == ["Alpha Community", "Beta Community"]
+
+    page = client.get("/api/communities", params={"league_id": setup.league.id, "limit": 1, "offset": 1})
+    assert page.status_code == 200, page.text
+    assert [item["name"] for item in page.json()] == ["Beta Community"]
+    assert Decimal(str(page.json()[0]["starting_balance"])) == Decimal("500.00")
+
+    wallets = client.get("/api/wallets", params={"limit": 1})
+    assert wallets.status_code == 200, wallets.text
+    assert [wallet["community_id"] for wallet in wallets.json()] == [setup.community.id]
+
+
 def test_create_table_populates_seats_and_defaults(client, db_session, auth_state, app_modules):
     models_module = app_modules["models"]
     setup = seed_league_graph(db_session, app_modules)
@@ -410,6 +459,79 @@ def test_create_table_populates_seats_and_defaults(client, db_session, auth_stat
 
 
 
+def test_internal_table_config_is_cached_until_table_is_deleted(client, db_session, auth_state, app_modules):
+    models_module = app_modules["models"]
+    setup = seed_league_graph(db_session, app_modules)
+    table = create_cash_table(db_session, models_module, setup.community, setup.owner, max_seats=3, buy_in=400)
+
+    first = client.get(f"/api/internal/tables/{table.id}")
+    assert first.status_code == 200, first.text
+    assert first.json()["max_seats"] == 3
+
+    # Served from the cache: a direct row edit is not seen until invalidation
+    table.max_seats = 5
+    db_session.commit()
+    assert client.get(f"/api/internal/tables/{table.id}").json()["max_seats"] == 3
+
+    cleanup = client.post(f"/api/internal/tables/{table.id}/check-cleanup")
+    assert cleanup.status_code == 200, cleanup.text
+    assert cleanup.json()["deleted"] is True
+    assert client.get(f"/api/internal/tables/{table.id}").status_code == 404
+
+
+def test_internal_wallet_debit_and_credit_update_balance_atomically(client, db_session, auth_state, app_modules):
+    models_module = app_modules["models"]
+    setup = seed_league_graph(db_session, app_modules)
+    wallet = create_wallet(db_session, models_module, setup.member, setup.community, 500)
+    operation = {"user_id": setup.member.id, "community_id": setup.community.id}
+
+    debit = client.post("/api/internal/wallets/debit", json={**operation, "amount": 200})
+    assert debit.status_code == 200, debit.text
+    assert debit.json()["success"] is True
+    assert float(debit.json()["new_balance"]) == 300.0
+
+    overdraw = client.post("/api/internal/wallets/debit", json={**operation, "amount": 301})
+    assert overdraw.status_code == 200, overdraw.text
+    assert overdraw.json()["success"] is False
+    assert float(overdraw.json()["new_balance"]) == 300.0
+
+    credit = client.post("/api/internal/wallets/credit", json={**operation, "amount": 50})
+    assert credit.status_code == 200, credit.text
+    assert float(credit.json()["new_balance"]) == 350.0
+    db_session.refresh(wallet)
+    assert float(wallet.balance) == 350.0
+
+    missing = {"user_id": setup.outsider.id, "community_id": setup.community.id, "amount": 10}
+    assert client.post("/api/internal/wallets/debit", json=missing).status_code == 404
+    assert client.post("/api/internal/wallets/credit", json=missing).status_code == 404
+
+
+def test_check_table_cleanup_keeps_permanent_and_occupied_tables(client, db_session, auth_state, app_modules):
+    models_module = app_modules["models"]
+    setup = seed_league_graph(db_session, app_modules)
+    permanent = create_cash_table(db_session, models_module, setup.community, setup.owner)
+    permanent.is_permanent = True
+    occupied = create_cash_table(db_session, models_module, setup.community, setup.owner)
+    seat = db_session.query(models_module.TableSeat).filter(models_module.TableSeat.table_id == occupied.id).first()
+    seat.user_id = setup.member.id
+    db_session.commit()
+
+    assert client.post(f"/api/internal/tables/{permanent.id}/check-cleanup").json() == {
+        "deleted": False,
+        "message": "Table is permanent",
+    }
+    assert client.post(f"/api/internal/tables/{occupied.id}/check-cleanup").json() == {
+        "deleted": False,
+        "message": "Table has 1 seated players",
+    }
+    assert client.post("/api/internal/tables/999999/check-cleanup").json() == {
+        "deleted": False,
+        "message": "Table not found",
+    }
+    db_session.expire_all()
+    assert db_session.query(models_module.Table).filter(models_module.Table.id.in_([permanent.id, occupied.id])).count() == 2
+
+
 def test_join_table_debits_wallet_and_calls_game_server(client, db_session, auth_state, app_modules, monkeypatch):
     models_module = app_modules["models"]
     setup = seed_league_graph(db_session, app_modules)
@@ -449,6 +571,31 @@ def test_join_table_debits_wallet_and_calls_game_server(client, db_session, auth
 
 
 
+def test_join_table_rolls_back_when_game_server_rejects_seat(client, db_session, auth_state, app_modules, monkeypatch):
+    models_module = app_modules["models"]
+    setup = seed_league_graph(db_session, app_modules)
+    wallet = create_wallet(db_session, models_module, setup.member, setup.community, 1200)
+    table = create_cash_table(db_session, models_module, setup.community, setup.owner)
+    set_current_user(auth_state, setup.member)
+
+    async def rejecting_post_game_server_json(path: str, payload: dict, timeout: float = 10.0) -> httpx.Response:
+        return httpx.Response(500, json={"error": "game unavailable"})
+
+    monkeypatch.setattr(app_modules["main"], "post_game_server_json", rejecting_post_game_server_json)
+
+    response = client.post(
+        f"/api/tables/{table.id}/join",
+        json={"buy_in_amount": 300, "seat_number": 2},
+    )
+
+    assert response.status_code == 503, response.text
+    db_session.refresh(wallet)
+    assert float(wallet.balance) == 1200.0
+    seat = db_session.query(models_module.TableSeat).filter(models_module.TableSeat.table_id == table.id, models_module.TableSeat.seat_number == 2).one()
+    assert seat.user_id is None
+    assert db_session.query(models_module.TableSession).filter(models_module.TableSession.table_id == table.id).count() == 0
+
+
 def test_rejoin_existing_seat_is_idempotent_and_does_not_double_debit(client, db_session, auth_state, app_modules, monkeypatch):
     models_module = app_modules["models"]
     setup = seed_league_graph(db_session, app_modules)
@@ -558,6 +705,46 @@ def test_queue_join_leave_and_reorder(client, db_session, auth_state, app_module
     assert queue_entries[0].position == 1
     assert int(queue_entries[0].reserved_buy_in_amount) == 300
 
+    queue_listing = client.get(f"/api/tables/{table.id}/queue")
+    assert queue_listing.status_code == 200, queue_listing.text
+    assert [(entry["username"], entry["position"]) for entry in queue_listing.json()] == [
+        (setup.outsider.username, 1),
+    ]
+
+    seat_listing = client.get(f"/api/tables/{table.id}/seats")
+    assert seat_listing.status_code == 200, seat_listing.text
+    assert [seat["username"] for seat in seat_listing.json()] == [setup.owner.username, occupant.username]
+
+
+def test_queue_leave_from_middle_closes_the_gap(client, db_session, auth_state, app_modules):
+    models_module = app_modules["models"]
+    setup = seed_league_graph(db_session, app_modules)
+    third = create_user(db_session, app_modules["auth"], models_module, "queue_third")
+    table = create_cash_table(db_session, models_module, setup.community, setup.owner, max_seats=2, buy_in=200)
+    queued_users = [setup.member, setup.outsider, third]
+    for position, user in enumerate(queued_users, start=1):
+        create_wallet(db_session, models_module, user, setup.community, 500)
+        db_session.add(models_module.TableQueue(
+            table_id=table.id,
+            user_id=user.id,
+            position=position,
+            reserved_buy_in_amount=200,
+        ))
+    db_session.commit()
+
+    set_current_user(auth_state, setup.outsider)
+    response = client.delete(f"/api/tables/{table.id}/queue/leave")
+    assert response.status_code == 204, response.text
+
+    db_session.expire_all()
+    remaining = (
+        db_session.query(models_module.TableQueue)
+        .filter(models_module.TableQueue.table_id == table.id)
+        .order_by(models_module.TableQueue.position)
+        .all()
+    )
+    assert [(entry.user_id, entry.position) for entry in remaining] == [(setup.member.id, 1), (third.id, 2)]
+
 
 def test_queue_join_rejects_non_full_table(client, db_session, auth_state, app_modules):
     models_module = app_modules["models"]
@@ -623,6 +810,43 @@ def test_community_table_summary_includes_queue_fields(client, db_session, auth_
 
 
 
+def test_community_table_summary_batches_tournament_registration_fields(client, db_session, auth_state, app_modules):
+    models_module = app_modules["models"]
+    setup = seed_league_graph(db_session, app_modules)
+    cash_table = create_cash_table(db_session, models_module, setup.community, setup.owner)
+    tournaments = []
+    for name in ("Tournament A", "Tournament B"):
+        tournament = models_module.Table(
+            community_id=setup.community.id,
+            name=name,
+            game_type=models_module.GameType.TOURNAMENT,
+            max_seats=4,
+            buy_in=100,
+            created_by_user_id=setup.owner.id,
+            tournament_state="scheduled",
+            tournament_start_time=datetime.now(timezone.utc) + timedelta(days=1),
+        )
+        db_session.add(tournament)
+        tournaments.append(tournament)
+    db_session.flush()
+    db_session.add_all([
+        models_module.TournamentRegistration(table_id=tournaments[0].id, user_id=setup.owner.id, status="registered"),
+        models_module.TournamentRegistration(table_id=tournaments[0].id, user_id=setup.member.id, status="confirmed"),
+        models_module.TournamentRegistration(table_id=tournaments[1].id, user_id=setup.owner.id, status="registered"),
+    ])
+    db_session.commit()
+
+    set_current_user(auth_state, setup.member)
+    response = client.get(f"/api/communities/{setup.community.id}/tables")
+    assert response.status_code == 200, response.text
+    by_id = {entry["id"]: entry for entry in response.json()}
+    assert by_id[tournaments[0].id]["tournament_registration_count"] == 2
+    assert by_id[tournaments[0].id]["tournament_is_registered"] is True
+    assert by_id[tournaments[1].id]["tournament_registration_count"] == 1
+    assert by_id[tournaments[1].id]["tournament_is_registered"] is False
+    assert by_id[cash_table.id]["tournament_registration_count"] is None
+
+
 def test_unseat_promotes_first_queued_player_and_debits_wallet(client, db_session, auth_state, app_modules, monkeypatch):
     models_module = app_modules["models"]
     setup = seed_league_graph(db_session, app_modules)
@@ -1335,6 +1559,15 @@ def test_hand_history_summary_and_detail_are_scoped_to_participants(client, db_s
     hand_id = response.json()["hand_id"]
     UUID(hand_id)
 
+    models_module = app_modules["models"]
+    participant_ids = {
+        row.user_id
+        for row in db_session.query(models_module.HandParticipant).filter(
+            models_module.HandParticipant.hand_id == UUID(hand_id)
+        )
+    }
+    assert participant_ids == {setup.owner.id, setup.member.id}
+
     set_current_user(auth_state, setup.owner)
     my_hands = client.get("/api/me/hands")
     assert my_hands.status_code == 200
@@ -1358,6 +1591,48 @@ def test_hand_history_summary_and_detail_are_scoped_to_participants(client, db_s
     assert outsider_detail.status_code == 404
 
 
+def test_hand_history_pages_with_keyset_cursor(client, db_session, auth_state, app_modules):
+    setup = seed_league_graph(db_session, app_modules)
+
+    hand_ids = []
+    for index in range(3):
+        response = client.post(
+            "/_internal/history/record",
+            json={
+                "community_id": setup.community.id,
+                "table_id": None,
+                "table_name": f"History Table {index}",
+                "hand_data": {
+                    "players": [{"user_id": setup.owner.id, "username": setup.owner.username, "seat_number": 1}],
+                    "pot": 10 * (index + 1),
+                    "winner": {"username": setup.owner.username},
+                },
+            },
+        )
+        assert response.status_code == 201, response.text
+        hand_ids.append(response.json()["hand_id"])
+
+    set_current_user(auth_state, setup.owner)
+    first_page = client.get("/api/me/hands", params={"limit": 2})
+    assert first_page.status_code == 200
+    assert [hand["id"] for hand in first_page.json()] == [hand_ids[2], hand_ids[1]]
+    assert first_page.json()[0]["pot_size"] == 30
+    assert first_page.json()[0]["winner_username"] == setup.owner.username
+    assert first_page.json()[0]["player_count"] == 1
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get("/api/me/hands", params={"limit": 2, "cursor": cursor})
+    assert second_page.status_code == 200
+    assert [hand["id"] for hand in second_page.json()] == [hand_ids[0]]
+    assert "X-Next-Cursor" not in second_page.headers
+
+    invalid_cursor = client.get("/api/me/hands", params={"cursor": "not-a-cursor"})
+    assert invalid_cursor.status_code == 400
+
+    oversized_page = client.get("/api/me/hands", params={"limit": 501})
+    assert oversized_page.status_code == 422
+
+
 def test_normal_public_mutation_routes_reject_partition_fields(client):
     register_response = client.post(
         "/auth/register",
@@ -1444,6 +1719,10 @@ def test_fixture_api_provisions_and_cleans_up_same_run_stack(client, db_session,
         assert payload["community_name"] == "E2E Community fixture-run-1"
         assert len(payload["users"]) == 2
         assert all(user["is_test_user"] is True for user in payload["users"])
+        for user in payload["users"]:
+            claims = app_modules["auth"].decode_token(user["access_token"])
+            assert claims["user_id"] == user["user_id"]
+            assert claims["test_run_tag"] == "fixture-run-1"
 
         fixture_run = db_session.query(models_module.TestFixtureRun).filter_by(run_tag="fixture-run-1").one()
         assert fixture_run.status == "active"
@@ -62,7 +62,7 @@ def test_create_league(token):
     response = requests.post(
         f"{BASE_URL}/api/leagues",
         json=data,
-        params={"token": token}
+        headers={"Authorization": f"Bearer {token}"}
     )
     print(f"   Status: {response.status_code}")
     if response.status_code == 201:
@@ -85,7 +85,7 @@ def test_create_community(token, league_id):
     response = requests.post(
         f"{BASE_URL}/api/communities",
         json=data,
-        params={"token": token}
+        headers={"Authorization": f"Bearer {token}"}
     )
     print(f"   Status: {response.status_code}")
     if response.status_code == 201:
@@ -101,7 +101,7 @@ def test_join_community(token, community_id):
     print("💰 Testing join community (creates wallet)...")
     response = requests.post(
         f"{BASE_URL}/api/communities/{community_id}/join",
-        params={"token": token}
+        headers={"Authorization": f"Bearer {token}"}
     )
     print(f"   Status: {response.status_code}")
     if response.status_code == 200:
@@ -117,7 +117,7 @@ def test_get_wallets(token):
     print("💳 Testing get wallets...")
     response = requests.get(
         f"{BASE_URL}/api/wallets",
-        params={"token": token}
+        headers={"Authorization": f"Bearer {token}"}
     )
     print(f"   Status: {response.status_code}")
     if response.status_code == 200:
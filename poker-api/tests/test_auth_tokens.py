@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+
+def test_decode_token_serves_repeat_calls_from_cache(app_modules, monkeypatch):
+    auth = app_modules["auth"]
+    token = auth.create_access_token({"user_id": 7, "username": "cached"})
+
+    assert auth.decode_token(token)["user_id"] == 7
+
+    def _fail_decode(*args, **kwargs):
+        raise AssertionError("cached token should not be verified again")
+
+    monkeypatch.setattr(auth.jwt, "decode", _fail_decode)
+    assert auth.decode_token(token)["username"] == "cached"
+
+
+def test_decode_token_rejects_expired_cached_token(app_modules, monkeypatch):
+    auth = app_modules["auth"]
+    token = auth.create_access_token({"user_id": 8, "username": "expiring"}, timedelta(minutes=5))
+    payload = auth.decode_token(token)
+
+    def _expired_decode(*args, **kwargs):
+        raise auth.JWTError("Signature has expired.")
+
+    monkeypatch.setattr(auth.time, "time", lambda: payload["exp"] + 1)
+    monkeypatch.setattr(auth.jwt, "decode", _expired_decode)
+    assert auth.decode_token(token) is None
+    assert token not in auth._token_cache
+
+
+def test_internal_verify_reports_ban_from_current_user_row(client, db_session, app_modules):
+    auth = app_modules["auth"]
+    models = app_modules["models"]
+    user = models.User(
+        username="verify_me",
+        email="verify_me@example.com",
+        hashed_password=auth.get_password_hash("password123"),
+        is_active=True,
+        email_verified=True,
+    )
+    db_session.add(user)
+    db_session.commit()
+    token = auth.create_access_token({"user_id": user.id, "username": user.username})
+
+    response = client.post("/api/internal/auth/verify", json={"token": token})
+    assert response.status_code == 200, response.text
+    assert response.json()["valid"] is True
+    assert response.json()["user_id"] == user.id
+
+    user.is_banned = True
+    db_session.commit()
+    response = client.post("/api/internal/auth/verify", json={"token": token})
+    assert response.json()["valid"] is False
+    assert response.json()["message"] == "User is banned"
+
+
+def test_bootstrap_admin_user_creates_then_promotes_without_rehashing(client, db_session, app_modules, monkeypatch):
+    main = app_modules["main"]
+    models = app_modules["models"]
+    monkeypatch.setattr(main.settings, "ADMIN_USERNAME", "bootadmin")
+    monkeypatch.setattr(main.settings, "ADMIN_EMAIL", "bootadmin@example.com")
+    monkeypatch.setattr(main.settings, "ADMIN_PASSWORD", "password123")
+    monkeypatch.setattr(main.settings, "ADMIN_RESET_PASSWORD", False)
+
+    main._bootstrap_admin_user()
+    admin = db_session.query(models.User).filter(models.User.username == "bootadmin").one()
+    assert admin.is_admin is True
+    original_hash = admin.hashed_password
+
+    admin.is_admin = False
+    db_session.commit()
+
+    def _fail_hash(password):
+        raise AssertionError("password should only be hashed on create or reset")
+
+    monkeypatch.setattr(main, "get_password_hash", _fail_hash)
+    main._bootstrap_admin_user()
+    db_session.expire_all()
+    admin = db_session.query(models.User).filter(models.User.username == "bootadmin").one()
+    assert admin.is_admin is True
+    assert admin.hashed_password == original_hash
@@ -300,6 +300,130 @@ def test_register_is_blocked_when_invite_only_registration_is_enabled(client, ap
     assert response.json()["detail"] == "Registration is invite-only for this beta"
 
 
+def test_register_reports_taken_username_and_email(client):
+    payload = {"username": "takenuser", "email": "taken@example.com", "password": "password123"}
+
+    created = client.post("/auth/register", json=payload)
+    assert created.status_code == 201
+    assert created.json()["username"] == "takenuser"
+    assert created.json()["created_at"]
+
+    same_username = client.post("/auth/register", json={**payload, "email": "other@example.com"})
+    assert same_username.status_code == 400
+    assert same_username.json()["detail"] == "Username already registered"
+
+    same_email = client.post("/auth/register", json={**payload, "username": "otheruser"})
+    assert same_email.status_code == 400
+    assert same_email.json()["detail"] == "Email already registered"
+
+
+def test_register_prefers_username_clash_when_both_fields_are_taken_by_different_users(client, db_session, app_modules):
+    create_user(db_session, app_modules["auth"], app_modules["models"], "clashname", email="first@example.com")
+    create_user(db_session, app_modules["auth"], app_modules["models"], "seconduser", email="clash@example.com")
+
+    response = client.post(
+        "/auth/register",
+        json={"username": "clashname", "email": "clash@example.com", "password": "password123"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username already registered"
+
+
+def test_production_register_rejects_taken_fields_before_staging_verification(client, db_session, app_modules, monkeypatch):
+    main_module = app_modules["main"]
+    models_module = app_modules["models"]
+    monkeypatch.setattr(main_module.settings, "ENV_MODE", "production")
+    sent_codes = []
+    monkeypatch.setattr(
+        main_module,
+        "_send_verification_email",
+        lambda email, username, code: sent_codes.append((email, code)),
+    )
+    create_user(db_session, app_modules["auth"], models_module, "produser", email="prod@example.com")
+    create_user(db_session, app_modules["auth"], models_module, "prodother", email="prodclash@example.com")
+
+    same_username = client.post(
+        "/auth/register",
+        json={"username": "produser", "email": "fresh@example.com", "password": "password123"},
+    )
+    assert same_username.status_code == 400
+    assert same_username.json()["detail"] == "Username already registered"
+
+    same_email = client.post(
+        "/auth/register",
+        json={"username": "freshuser", "email": "prod@example.com", "password": "password123"},
+    )
+    assert same_email.status_code == 400
+    assert same_email.json()["detail"] == "Email already registered"
+
+    both_taken = client.post(
+        "/auth/register",
+        json={"username": "produser", "email": "prodclash@example.com", "password": "password123"},
+    )
+    assert both_taken.status_code == 400
+    assert both_taken.json()["detail"] == "Username already registered"
+
+    assert sent_codes == []
+    assert db_session.query(models_module.EmailVerification).count() == 0
+
+    staged = client.post(
+        "/auth/register",
+        json={"username": "freshuser", "email": "fresh@example.com", "password": "password123"},
+    )
+    assert staged.status_code == 201
+    assert staged.json()["requires_verification"] is True
+    assert [email for email, _ in sent_codes] == ["fresh@example.com"]
+
+
+def test_beta_invite_accept_reports_taken_username_and_case_insensitive_email(
+    client, db_session, auth_state, app_modules, monkeypatch
+):
+    auth_module = app_modules["auth"]
+    main_module = app_modules["main"]
+    models_module = app_modules["models"]
+    admin_user = create_user(db_session, auth_module, models_module, "admintaken", is_admin=True)
+    set_current_user(auth_state, admin_user)
+    monkeypatch.setattr(main_module.settings, "BETA_INVITE_BASE_URL", "https://beta.example.com")
+    monkeypatch.setattr(main_module, "_generate_beta_invite_token", lambda: "taken-token")
+    monkeypatch.setattr(main_module, "_send_beta_invite_email", lambda *args, **kwargs: True)
+
+    created = client.post(
+        "/api/admin/beta-invites",
+        headers=UI_HEADERS,
+        json={"email": "invitee@example.com"},
+    )
+    assert created.status_code == 201
+
+    create_user(db_session, auth_module, models_module, "existingname", email="someone@example.com")
+
+    same_username = client.post(
+        "/auth/invite/taken-token/accept",
+        headers=UI_HEADERS,
+        json={"username": "existingname", "password": "password123"},
+    )
+    assert same_username.status_code == 400
+    assert same_username.json()["detail"] == "Username already registered"
+
+    create_user(db_session, auth_module, models_module, "emailowner", email="Invitee@Example.com")
+
+    same_email = client.post(
+        "/auth/invite/taken-token/accept",
+        headers=UI_HEADERS,
+        json={"username": "brandnewuser", "password": "password123"},
+    )
+    assert same_email.status_code == 409
+    assert same_email.json()["detail"] == "Email already registered"
+
+    both_taken = client.post(
+        "/auth/invite/taken-token/accept",
+        headers=UI_HEADERS,
+        json={"username": "existingname", "password": "password123"},
+    )
+    assert both_taken.status_code == 400
+    assert both_taken.json()["detail"] == "Username already registered"
+
+
 def test_create_invite_revokes_previous_pending_invite_for_same_email(client, db_session, auth_state, app_modules, monkeypatch):
     auth_module = app_modules["auth"]
     main_module = app_modules["main"]
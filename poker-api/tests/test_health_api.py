@@ -116,3 +116,14 @@ def test_health_reports_healthy_when_g5_is_explicitly_disabled(client, app_modul
     assert body["g5_advisor"]["http_status"] is None
     assert body["g5_advisor"]["startup_stage"] == "disabled"
     assert body["g5_advisor"]["error"] is None
+
+
+def test_root_reports_app_name_and_version(client, app_modules):
+    settings = app_modules["main"].settings
+
+    for _ in range(2):
+        response = client.get("/", headers={"Origin": "http://localhost:5173"})
+
+        assert response.status_code == 200
+        assert response.json() == {"app": settings.APP_NAME, "version": settings.VERSION, "status": "running"}
+        assert response.headers.get_list("access-control-allow-origin") == ["http://localhost:5173"]
@@ -17,3 +17,9 @@ def test_settings_parse_json_array_cors_origins():
         "https://beta.example.com",
         "https://app.example.com",
     ]
+
+
+def test_settings_bcrypt_rounds_default_by_environment():
+    assert Settings(ENV_MODE="dev").bcrypt_rounds == 10
+    assert Settings(ENV_MODE="production").bcrypt_rounds == 12
+    assert Settings(ENV_MODE="production", BCRYPT_ROUNDS=13).bcrypt_rounds == 13
@@ -9,6 +9,7 @@ Usage:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import sys
 
@@ -16,6 +17,11 @@ import sys
 AUTH_API_URL = 'http://localhost:8000'
 GAME_SERVER_URL = 'http://localhost:3000'
 
+# One pooled session for the whole flow, so each step reuses the keep-alive
+# connection instead of opening a new one
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
 def test_websocket_agent():
     """Test the WebSocket agent functionality"""
     
@@ -33,7 +39,7 @@ def test_websocket_agent():
     
     # Step 1: Register the bot
     try:
-        response = requests.post(
+        response = session.post(
             f"{AUTH_API_URL}/auth/register",
             json={
                 'username': bot_username,
@@ -57,7 +63,7 @@ def test_websocket_agent():
     # Step 2: Login to get JWT
     try:
         print(f"\n🔐 Logging in as {bot_username}...")
-        response = requests.post(
+        response = session.post(
             f"{AUTH_API_URL}/auth/login",
             params={
                 'username': bot_username,
@@ -68,6 +74,7 @@ def test_websocket_agent():
         if response.status_code == 200:
             login_data = response.json()
             jwt_token = login_data['access_token']
+            session.headers["Authorization"] = f"Bearer {jwt_token}"
             print(f"✅ Login successful! JWT token obtained")
         else:
             print(f"❌ Login failed: {response.status_code}")
@@ -80,10 +87,9 @@ def test_websocket_agent():
     # Step 3: Create a league
     try:
         print(f"\n🏆 Creating test league...")
-        response = requests.post(
+        response = session.post(
             f"{AUTH_API_URL}/api/leagues",
-            json={'name': f'Test League {int(time.time())}'},
-            params={'token': jwt_token}
+            json={'name': f'Test League {int(time.time())}'}
         )
         
         if response.status_code in [200, 201]:
@@ -101,14 +107,13 @@ def test_websocket_agent():
     # Step 4: Create a community
     try:
         print(f"\n🏘️  Creating test community...")
-        response = requests.post(
+        response = session.post(
             f"{AUTH_API_URL}/api/communities",
             json={
                 'name': f'Test Community {int(time.time())}',
                 'description': 'Test community for WebSocket agent',
                 'league_id': league_id
-            },
-            params={'token': jwt_token}
+            }
         )
         
         if response.status_code in [200, 201]:
@@ -126,9 +131,8 @@ def test_websocket_agent():
     # Step 5: Join the community (creates wallet)
     try:
         print(f"\n💰 Joining community (creates wallet)...")
-        response = requests.post(
-            f"{AUTH_API_URL}/api/communities/{community_id}/join",
-            params={'token': jwt_token}
+        response = session.post(
+            f"{AUTH_API_URL}/api/communities/{community_id}/join"
         )
         
         if response.status_code == 200:
@@ -144,7 +148,7 @@ def test_websocket_agent():
     # Step 6: Create a table
     try:
         print(f"\n🎰 Creating poker table...")
-        response = requests.post(
+        response = session.post(
             f"{AUTH_API_URL}/api/communities/{community_id}/tables",
             json={
                 'name': 'WebSocket Agent Test Table',
@@ -153,8 +157,7 @@ def test_websocket_agent():
                 'small_blind': 10,
                 'big_blind': 20,
                 'buy_in': 1000
-            },
-            params={'token': jwt_token}
+            }
         )
         
         if response.status_code in [200, 201]:
@@ -173,10 +176,9 @@ def test_websocket_agent():
     # Step 7: Join the table
     try:
         print(f"\n💺 Joining table with 1000 chip buy-in...")
-        response = requests.post(
+        response = session.post(
             f"{AUTH_API_URL}/api/tables/{table_id}/join",
-            json={'buy_in_amount': 1000},
-            params={'token': jwt_token}
+            json={'buy_in_amount': 1000}
         )
         
         if response.status_code == 200:
@@ -11,6 +11,7 @@ isolation, then cleans the run up.
 from __future__ import annotations
 
 import argparse
+import base64
 import json
 import os
 import re
@@ -73,14 +74,6 @@ except ModuleNotFoundError as exc:  # pragma: no cover - startup dependency guar
         "to an interpreter with the documented requirements installed."
     ) from exc
 
-try:
-    from jose import jwt
-except ModuleNotFoundError as exc:  # pragma: no cover - startup dependency guard
-    raise SystemExit(
-        "Missing dependency 'python-jose'. Use ~/.virtualenvs/poker/bin/python or set PYTHON_BIN "
-        "to an interpreter with the documented requirements installed."
-    ) from exc
-
 try:
     import socketio
 except ModuleNotFoundError as exc:  # pragma: no cover - startup dependency guard
@@ -280,9 +273,14 @@ def _health_check(url: str, label: str) -> None:
         raise SmokeTestError(f"{label} health check returned unexpected payload: {payload}")
 
 
+def _decode_payload_unsafe(access_token: str) -> dict[str, Any]:
+    """Read a JWT's claims without verifying it; the server already has."""
+    segment = access_token.split(".")[1]
+    return json.loads(base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4)))
+
+
 def _decode_user_id(access_token: str) -> int:
-    payload = jwt.decode(access_token, key="", options={"verify_signature": False})
-    return int(payload["user_id"])
+    return int(_decode_payload_unsafe(access_token)["user_id"])
 
 
 def _login_user(auth_api_url: str, username: str, password: str) -> tuple[str, int]:
@@ -386,7 +384,11 @@ def _cleanup_fixture_stack(auth_api_url: str, admin_token: str, run_tag: str) ->
 
 
 def _create_session_user(auth_api_url: str, fixture_user: dict[str, Any], *, is_bot: bool) -> SessionUser:
-    token, user_id = _login_user(auth_api_url, str(fixture_user["username"]), str(fixture_user["password"]))
+    token = fixture_user.get("access_token")
+    if token:
+        user_id = _decode_user_id(token)
+    else:
+        token, user_id = _login_user(auth_api_url, str(fixture_user["username"]), str(fixture_user["password"]))
     return SessionUser(
         user_id=user_id,
         username=str(fixture_user["username"]),
@@ -503,7 +505,7 @@ def _disconnect_bots(bot_handles: list[BotHandle], stop_event: threading.Event)
     for handle in bot_handles:
         try:
             if handle.agent.connected:
-                handle.agent.sio.disconnect()
+                handle.agent.disconnect()
         except Exception:
             continue
     for handle in bot_handles: